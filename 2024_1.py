@@ -1,8 +1,8 @@
-import aocd
-import re
 import math
+import mmap
 
 import cli
+import inputs
 
 sample_data = """\
 3   4
@@ -11,27 +11,69 @@ sample_data = """\
 1   3
 3   9
 3   3"""
-data = sample_data if cli.sample else aocd.data
 
-left_list, right_list = zip(
-    *[[int(n) for n in re.sub(" +", " ", line).split()] for line in data.splitlines()]
-)
 
-left_list = sorted(left_list)
-right_list = sorted(right_list)
+# both sorted, as int64 NumPy arrays
+Lists = tuple
 
-distances = [abs(l - r) for (l, r) in zip(left_list, right_list)]
-total_distance = sum(distances)
 
-print(f"Problem 1: {total_distance}")
+def split_lists(numbers) -> Lists:
+    left_list = numbers[0::2].copy()
+    right_list = numbers[1::2].copy()
+    left_list.sort()
+    right_list.sort()
+    return left_list, right_list
 
-duplicate_numbers = [n for n in left_list if n in right_list]
-similarities = [right_list.count(n) * n for n in duplicate_numbers]
-total_similarity = sum(similarities)
 
-print(f"Problem 2: {total_similarity}")
+def parse(data: str) -> Lists:
+    import numpy as np
 
-if cli.visualize:
+    # any whitespace separates, so this reads the pairs line by line
+    return split_lists(np.fromstring(data, dtype=np.int64, sep=" "))
+
+
+def parse_stream(raw: mmap.mmap | bytes, chunk_size: int = 1 << 24) -> Lists:
+    """
+    Like parse, but reads raw input bytes in chunks of whole lines, so that inputs with
+    tens of millions of pairs never exist as one decoded string.
+    """
+    import numpy as np
+
+    chunks = [
+        np.fromstring(chunk, dtype=np.int64, sep=" ")
+        for chunk in inputs.iter_line_chunks(raw, chunk_size)
+    ]
+    return split_lists(np.concatenate(chunks) if chunks else np.zeros(0, np.int64))
+
+
+################################################################################################
+# Problem 1
+def part1(lists: Lists) -> int:
+    left_list, right_list = lists
+
+    total_distance = abs(left_list - right_list).sum()
+    return int(total_distance)
+
+
+################################################################################################
+# Problem 2
+def part2(lists: Lists) -> int:
+    import numpy as np
+
+    left_list, right_list = lists
+    if len(right_list) == 0:
+        return 0
+
+    # look up how often each left number shows up on the right
+    numbers, counts = np.unique(right_list, return_counts=True)
+    indices = np.searchsorted(numbers, left_list).clip(max=len(numbers) - 1)
+    duplicates = numbers[indices] == left_list
+    similarities = left_list[duplicates] * counts[indices[duplicates]]
+    total_similarity = similarities.sum()
+    return int(total_similarity)
+
+
+def visualize(left_list: list[int], right_list: list[int]):
     import pathlib
     import scipy.spatial
     import manim
@@ -176,3 +218,16 @@ if cli.visualize:
     if cli.sample:
         manim.config.output_file = f"{manim.config.output_file}_sample"
     LocationsScene().render()
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    if cli.sample:
+        lists = parse(sample_data)
+    else:
+        lists = parse_stream(inputs.get_bytes(cli.day))
+    print(f"Problem 1: {part1(lists)}")
+    print(f"Problem 2: {part2(lists)}")
+
+    if cli.visualize:
+        visualize(*(list.tolist() for list in lists))
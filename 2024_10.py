@@ -1,9 +1,6 @@
-import aocd
-import operator
-import itertools
-import functools
-
 import cli
+import inputs
+from grid import Grid
 
 sample_data = """\
 89010123
@@ -14,85 +11,53 @@ sample_data = """\
 32019012
 01329801
 10456732"""
-data = sample_data if cli.sample else aocd.data
-flat_data = "".join(data.splitlines())
-
-mountains = data.splitlines()
-width = len(mountains[0])
-height = len(mountains)
-flat_idx_to_coords = lambda i: (i % width, i // width)
-is_in_range = lambda p: p[0] >= 0 and p[1] >= 0 and p[0] < width and p[1] < height
-neighbour = lambda pos, dir: (pos[0] + dir[0], pos[1] + dir[1])
-is_one_up = lambda h, pos: int(mountains[pos[1]][pos[0]]) == h + 1
-
-directions = [
-    (-1, 0),
-    (+1, 0),
-    (0, -1),
-    (0, +1),
-]
-pos_in_range_map = {
-    (-1, 0): lambda x: x[0] >= 0,
-    (+1, 0): lambda x: x[0] < width,
-    (0, -1): lambda x: x[1] >= 0,
-    (0, +1): lambda x: x[1] < height,
-}
-
-starting_positions = list(
-    map(flat_idx_to_coords, [i for i, h in enumerate(flat_data) if h == "0"])
-)
+
+
+def parse(data: str) -> Grid:
+    # the border is 0, which is never one up from any height
+    return Grid.parse(data)
 
 
 ################################################################################################
 # Problem 1
-def start_position_score(pos):
-    def high_points_reached(h, pos):
-        if h == 9:
-            return [pos]
+def part1(mountains: Grid) -> int:
+    offsets = mountains.offsets_4
 
-        return itertools.chain.from_iterable(
-            map(
-                functools.partial(high_points_reached, h + 1),
-                filter(
-                    functools.partial(is_one_up, h),
-                    filter(
-                        is_in_range, map(functools.partial(neighbour, pos), directions)
-                    ),
-                ),
-            )
-        )
+    def high_points_reached(h: int, i: int) -> set[int]:
+        if h == ord("9"):
+            return {i}
 
-    return len(set(high_points_reached(0, pos)))
+        reached = set()
+        for offset in offsets:
+            if mountains[i + offset] == h + 1:
+                reached |= high_points_reached(h + 1, i + offset)
+        return reached
 
-
-high_points_trail_heads = filter(
-    operator.truth, map(start_position_score, starting_positions)
-)
-print(f"Problem 1: {sum(high_points_trail_heads)}")
+    return sum(len(high_points_reached(ord("0"), i)) for i in mountains.find_all(b"0"))
 
 
 ################################################################################################
 # Problem 2
-def start_position_score(pos):
-    def num_trails_available(x, y, h):
-        if h == 9:
+def part2(mountains: Grid) -> int:
+    offsets = mountains.offsets_4
+
+    def num_trails_available(h: int, i: int) -> int:
+        if h == ord("9"):
             return 1
 
         score = 0
-        for dir in directions:
-            tx = x + dir[0]
-            ty = y + dir[1]
-            if pos_in_range_map[dir]((tx, ty)) and int(mountains[ty][tx]) == h + 1:
-                score += num_trails_available(tx, ty, h + 1)
+        for offset in offsets:
+            if mountains[i + offset] == h + 1:
+                score += num_trails_available(h + 1, i + offset)
         return score
 
-    (x, y) = pos
-    return num_trails_available(x, y, 0)
+    return sum(num_trails_available(ord("0"), i) for i in mountains.find_all(b"0"))
+
 
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
 
-trails_reached_trail_heads = list(
-    itertools.filterfalse(
-        lambda x: x == 0, map(start_position_score, starting_positions)
-    )
-)
-print(f"Problem 2: {sum(trails_reached_trail_heads)}")
+    mountains = parse(data)
+    print(f"Problem 1: {part1(mountains)}")
+    print(f"Problem 2: {part2(mountains)}")
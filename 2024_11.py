@@ -1,16 +1,17 @@
-import aocd
 import itertools
 import functools
-from tqdm import tqdm as progress
 from typing import Iterable, DefaultDict
 
 import cli
+import inputs
+from progress import progress
 
 sample_data = """\
 125 17"""
-data = sample_data if cli.sample else aocd.data
 
-stones = list(map(int, data.split()))
+
+def parse(data: str) -> list[int]:
+    return list(map(int, data.split()))
 
 
 ################################################################################################
@@ -38,13 +39,14 @@ def multi_steps(steps: int, stones: Iterable[int]) -> Iterable[int]:
     )
 
 
-after_25_steps = multi_steps(25, stones)
-print(f"Problem 1: {len(list(after_25_steps))}")
+def part1(stones: list[int]) -> int:
+    after_25_steps = multi_steps(25, stones)
+    return len(list(after_25_steps))
 
 
 ################################################################################################
 # Problem 2
-def multi_steps(steps: int, stones: Iterable[int]) -> DefaultDict[int, int]:
+def multi_steps_counted(steps: int, stones: Iterable[int]) -> DefaultDict[int, int]:
     stone_counts = DefaultDict[int, int](lambda: 0)
 
     for stone in stones:
@@ -69,5 +71,15 @@ def multi_steps(steps: int, stones: Iterable[int]) -> DefaultDict[int, int]:
     return stone_counts
 
 
-after_75_steps = multi_steps(75, stones)
-print(f"Problem 2: {sum(after_75_steps.values())}")
+def part2(stones: list[int]) -> int:
+    after_75_steps = multi_steps_counted(75, stones)
+    return sum(after_75_steps.values())
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    stones = parse(data)
+    print(f"Problem 1: {part1(stones)}")
+    print(f"Problem 2: {part2(stones)}")
@@ -1,12 +1,12 @@
-import aocd
-import re
 import operator
 import functools
 import itertools
 from typing import NamedTuple
-from tqdm import tqdm as progress
 
 import cli
+import inputs
+from grid import Grid
+from progress import progress
 
 sample_data = """\
 RRRRIICCFF
@@ -19,14 +19,6 @@ VVIIICJJEE
 MIIIIIJJEE
 MIIISIJEEE
 MMMISSJEEE"""
-data = sample_data if cli.sample else aocd.data
-
-gardens = data.splitlines()
-width = len(gardens[0])
-height = len(gardens)
-flat_idx_to_coords = lambda i: (i % width, i // width)
-is_in_range = lambda p: p[0] >= 0 and p[1] >= 0 and p[0] < width and p[1] < height
-get_neighbour = lambda pos, dir: (pos[0] + dir[0], pos[1] + dir[1])
 
 directions = [
     (-1, 0),
@@ -35,49 +27,68 @@ directions = [
     (0, +1),
 ]
 
-types = set(re.findall(r"\w", data))
-
 Coordinate = tuple[int, int]
 RegionId = int
 RegionType = str
 Region = list[Coordinate]
 RegionsMap = list[list[RegionId | None]]
 
-################################################################################################
-# Problem 1
-regions_map: RegionsMap = [[None] * width for _ in range(height)]
-regions: list[Region] = []
-
-
-def find_region_at(regions_map: RegionsMap, pos: Coordinate) -> Region | None:
-    (x, y) = pos
-    if regions_map[y][x] is None:
-        region_type = gardens[y][x]
-
-        def flood_fill(
-            regions_map: RegionsMap,
-            pos: Coordinate,
-            id: RegionId,
-            region_type: RegionType,
-        ) -> Region:
-            coordinates: list[Coordinate] = [pos]
-            (x, y) = pos
-            regions_map[y][x] = id
-            for neighbour in filter(
-                is_in_range, map(functools.partial(get_neighbour, pos), directions)
-            ):
-                (nx, ny) = neighbour
-                if regions_map[ny][nx] is None and gardens[ny][nx] == region_type:
-                    coordinates.extend(
-                        flood_fill(regions_map, neighbour, id, region_type)
-                    )
-            return coordinates
+Regions = tuple[RegionsMap, list[Region]]
+
+get_neighbour = lambda pos, dir: (pos[0] + dir[0], pos[1] + dir[1])
+
+
+def make_is_in_range(width: int, height: int):
+    return lambda p: p[0] >= 0 and p[1] >= 0 and p[0] < width and p[1] < height
+
+
+def find_region_at(
+    gardens: Grid, regions_map: RegionsMap, index: int, new_id: RegionId
+) -> Region | None:
+    (x, y) = gardens.coords(index)
+    if regions_map[y][x] is not None:
+        return None
+
+    # the border never matches a region type, so no bounds checks needed
+    region_type = gardens[index]
+    regions_map[y][x] = new_id
+    coordinates: list[Coordinate] = []
+    to_visit = [index]
+    while to_visit:
+        index = to_visit.pop()
+        coordinates.append(gardens.coords(index))
+        for offset in gardens.offsets_4:
+            neighbour = index + offset
+            if gardens[neighbour] == region_type:
+                (nx, ny) = gardens.coords(neighbour)
+                if regions_map[ny][nx] is None:
+                    regions_map[ny][nx] = new_id
+                    to_visit.append(neighbour)
+    return coordinates
+
 
-        new_id = len(regions)
-        return flood_fill(regions_map, pos, new_id, region_type)
+def parse(data: str) -> Regions:
+    gardens = Grid.parse(data)
 
+    regions_map: RegionsMap = [[None] * gardens.width for _ in range(gardens.height)]
+    regions: list[Region] = []
+
+    if cli.verbose:
+        print("Finding Regions...")
+    for i in progress(gardens.indices(), total=gardens.width * gardens.height):
+        if new_region := find_region_at(gardens, regions_map, i, len(regions)):
+            regions.append(new_region)
+
+    return regions_map, regions
+
+
+################################################################################################
+# Problem 1
+def compute_region_circumference(regions_map: RegionsMap, region: Region):
+    width = len(regions_map[0])
+    height = len(regions_map)
+    is_in_range = make_is_in_range(width, height)
 
-def compute_region_circumference(region: Region):
     circumference = 0
     (x0, y0) = region[0]
     region_type = regions_map[y0][x0]
@@ -89,28 +100,32 @@ def compute_region_circumference(region: Region):
     return circumference
 
 
-print("Finding Regions...")
-for i in progress(range(0, width * height)):
-    pos = flat_idx_to_coords(i)
-    if new_region := find_region_at(regions_map, pos):
-        regions.append(new_region)
+def part1(regions: Regions) -> int:
+    regions_map, regions = regions
 
-print("Computing Areas...")
-region_areas = [len(region) for region in progress(regions)]
+    if cli.verbose:
+        print("Computing Areas...")
+    region_areas = [len(region) for region in progress(regions)]
 
-print("Computing Circumferences...")
-region_circumferences = [
-    compute_region_circumference(region) for region in progress(regions)
-]
+    if cli.verbose:
+        print("Computing Circumferences...")
+    region_circumferences = [
+        compute_region_circumference(regions_map, region)
+        for region in progress(regions)
+    ]
 
-print(
-    f"Problem 1: {sum(itertools.starmap(operator.mul, zip(region_areas, region_circumferences)))}"
-)
+    return sum(
+        itertools.starmap(operator.mul, zip(region_areas, region_circumferences))
+    )
 
 
 ################################################################################################
 # Problem 2
-def compute_region_sides(region: Region):
+def compute_region_sides(regions_map: RegionsMap, region: Region):
+    width = len(regions_map[0])
+    height = len(regions_map)
+    is_in_range = make_is_in_range(width, height)
+
     # Coordinates of edges point to the vertices between cells
     # where the top-left corner of a cell is the same coordinate as the cell
     # and edges always go clock-wise
@@ -195,9 +210,24 @@ def compute_region_sides(region: Region):
     return len(edges)
 
 
-print("Computing Num Sides...")
-region_sides = [compute_region_sides(region) for region in progress(regions)]
+def part2(regions: Regions) -> int:
+    regions_map, regions = regions
+
+    region_areas = [len(region) for region in regions]
+
+    if cli.verbose:
+        print("Computing Num Sides...")
+    region_sides = [
+        compute_region_sides(regions_map, region) for region in progress(regions)
+    ]
+
+    return sum(itertools.starmap(operator.mul, zip(region_areas, region_sides)))
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
 
-print(
-    f"Problem 2: {sum(itertools.starmap(operator.mul, zip(region_areas, region_sides)))}"
-)
+    regions = parse(data)
+    print(f"Problem 1: {part1(regions)}")
+    print(f"Problem 2: {part2(regions)}")
@@ -1,8 +1,8 @@
-import aocd
 from typing import NamedTuple
-from tqdm import tqdm as progress
 
 import cli
+import inputs
+from progress import progress
 
 sample_data = """\
 Button A: X+94, Y+34
@@ -20,7 +20,6 @@ Prize: X=7870, Y=6450
 Button A: X+69, Y+23
 Button B: X+27, Y+71
 Prize: X=18641, Y=10279"""
-data = sample_data if cli.sample else aocd.data
 
 Vector = tuple[int, int]
 
@@ -70,7 +69,8 @@ class GameSolution(NamedTuple):
         return self.a_presses * 3 + self.b_presses
 
 
-games = list(map(Game, data.split("\n\n")))
+def parse(data: str) -> list[Game]:
+    return list(map(Game, data.split("\n\n")))
 
 
 ################################################################################################
@@ -101,14 +101,14 @@ def solve_game(game: Game) -> GameSolution | None:
     return GameSolution(a_presses, b_presses)
 
 
-solutions = list(filter(None, progress(map(solve_game, games))))
-tokens_used = list(map(GameSolution.tokens_needed, solutions))
-print(f"Problem 1: {sum(tokens_used)}")
+def part1(games: list[Game]) -> int:
+    solutions = list(filter(None, progress(map(solve_game, games))))
+    tokens_used = list(map(GameSolution.tokens_needed, solutions))
+    return sum(tokens_used)
+
 
 ################################################################################################
 # Problem 2
-
-
 def in_actual_positions(game: Game) -> Game:
     real_price_placement = (
         game.price_placement[0] + 10000000000000,
@@ -121,7 +121,17 @@ def in_actual_positions(game: Game) -> Game:
     )
 
 
-real_games = list(map(in_actual_positions, games))
-real_solutions = list(filter(None, progress(map(solve_game, real_games))))
-real_tokens_used = list(map(GameSolution.tokens_needed, real_solutions))
-print(f"Problem 2: {sum(real_tokens_used)}")
+def part2(games: list[Game]) -> int:
+    real_games = list(map(in_actual_positions, games))
+    real_solutions = list(filter(None, progress(map(solve_game, real_games))))
+    real_tokens_used = list(map(GameSolution.tokens_needed, real_solutions))
+    return sum(real_tokens_used)
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    games = parse(data)
+    print(f"Problem 1: {part1(games)}")
+    print(f"Problem 2: {part2(games)}")
@@ -1,14 +1,12 @@
-import aocd
 import re
-import math
 import functools
-from typing import NamedTuple
-from tqdm import tqdm as progress
-
-from PIL import Image
-import numpy as np
+import itertools
+from typing import Iterator, NamedTuple
 
 import cli
+import inputs
+from progress import progress
+from vector import Vector, VectorArray
 
 sample_data = """\
 p=0,4 v=3,-3
@@ -23,33 +21,13 @@ p=9,3 v=2,3
 p=7,3 v=-1,2
 p=2,4 v=2,-3
 p=9,5 v=-3,-3"""
-data = sample_data if cli.sample else aocd.data
-width = 11 if cli.sample else 101
-height = 7 if cli.sample else 103
-
-
-class Vector(NamedTuple):
-    x: int
-    y: int
-
-    def __add__(lhs, rhs):
-        return Vector(lhs.x + rhs.x, lhs.y + rhs.y)
-
-    def __sub__(lhs, rhs):
-        return Vector(lhs.x - rhs.x, lhs.y - rhs.y)
-
-    def __mul__(lhs, rhs: int):
-        return Vector(lhs.x * rhs, lhs.y * rhs)
-
-    def __truediv__(lhs, rhs: int):
-        return Vector(lhs.x / rhs, lhs.y / rhs)
 
 
 class Robot(NamedTuple):
     pos: Vector
     vel: Vector
 
-    def move(self, steps: int):
+    def move(self, steps: int, width: int, height: int):
         (nx, ny) = self.pos + self.vel * steps
         nx = ((nx % width) + width) % width
         ny = ((ny % height) + height) % height
@@ -62,63 +40,103 @@ def make_robot(setup: str):
     return Robot(Vector(int(px), int(py)), Vector(int(vx), int(vy)))
 
 
-robots = list(map(make_robot, data.split("\n")))
+class Lobby(NamedTuple):
+    robots: list[Robot]
+    width: int
+    height: int
+
+
+def parse(data: str) -> Lobby:
+    width = 11 if cli.sample else 101
+    height = 7 if cli.sample else 103
+    return Lobby(list(map(make_robot, data.split("\n"))), width, height)
 
 
 ################################################################################################
 # Problem 1
-moved_robots = list(map(functools.partial(Robot.move, steps=100), progress(robots)))
-tl_quadrant = list(
-    filter(lambda r: r.pos.x < width // 2 and r.pos.y < height // 2, moved_robots)
-)
-tr_quadrant = list(
-    filter(lambda r: r.pos.x > width // 2 and r.pos.y < height // 2, moved_robots)
-)
-br_quadrant = list(
-    filter(lambda r: r.pos.x > width // 2 and r.pos.y > height // 2, moved_robots)
-)
-bl_quadrant = list(
-    filter(lambda r: r.pos.x < width // 2 and r.pos.y > height // 2, moved_robots)
-)
-solution = len(tl_quadrant) * len(tr_quadrant) * len(br_quadrant) * len(bl_quadrant)
-print(f"Problem 1: {solution}")
+def part1(lobby: Lobby) -> int:
+    (robots, width, height) = lobby
+
+    moved_robots = list(
+        map(
+            functools.partial(Robot.move, steps=100, width=width, height=height),
+            progress(robots),
+        )
+    )
+    tl_quadrant = list(
+        filter(lambda r: r.pos.x < width // 2 and r.pos.y < height // 2, moved_robots)
+    )
+    tr_quadrant = list(
+        filter(lambda r: r.pos.x > width // 2 and r.pos.y < height // 2, moved_robots)
+    )
+    br_quadrant = list(
+        filter(lambda r: r.pos.x > width // 2 and r.pos.y > height // 2, moved_robots)
+    )
+    bl_quadrant = list(
+        filter(lambda r: r.pos.x < width // 2 and r.pos.y > height // 2, moved_robots)
+    )
+    return len(tl_quadrant) * len(tr_quadrant) * len(br_quadrant) * len(bl_quadrant)
 
 
 ################################################################################################
 # Problem 2
-def average_distance(robots: list[Robot]) -> Vector:
-    def vec_len(vec: Vector):
-        return math.sqrt(vec.x * vec.x + vec.y * vec.y)
-
-    return vec_len(
-        sum(map(lambda x: x.pos, robots), Vector(0, 0)) / len(robots)
-        - Vector(width // 2 + 1, height // 2 + 1)
+def average_distance(positions: VectorArray, width: int, height: int) -> float:
+    return (positions.mean() - Vector(width // 2 + 1, height // 2 + 1)).len()
+
+
+def simulate_states(
+    robots: list[Robot], width: int, height: int
+) -> Iterator[VectorArray]:
+    # all robots move at once, one state per second until they loop around
+    positions = VectorArray.from_vectors(robot.pos for robot in robots)
+    velocities = VectorArray.from_vectors(robot.vel for robot in robots)
+    area = Vector(width, height)
+    for i in progress(range(width * height)):
+        yield positions
+        positions = (positions + velocities) % area
+
+
+def part2(lobby: Lobby) -> int:
+    (robots, width, height) = lobby
+
+    states = simulate_states(robots, width, height)
+    distances = list(
+        map(
+            functools.partial(average_distance, width=width, height=height),
+            states,
+        )
     )
+    (i_max, d_max) = max(enumerate(distances), key=lambda x: x[1])
+    return i_max
 
 
-states = []
-for i in progress(range(width * height)):
-    states.append(robots)
-    robots = list(map(functools.partial(Robot.move, steps=1), robots))
-distances = list(map(average_distance, states))
-(i_max, d_max) = max(enumerate(distances), key=lambda x: x[1])
+def render_robots(positions: VectorArray, width: int, height: int):
+    from PIL import Image
+    import numpy as np
 
-print(f"Problem 2: {i_max}")
+    flags = [[False] * width for _ in range(height)]
+    for pos in positions:
+        flags[pos.y][pos.x] = True
 
+    flags = np.array(flags)
 
-if cli.verbose:
+    size = flags.shape[::-1]
+    flags_bytes = np.packbits(flags, axis=1)
+    image = Image.frombytes(mode="1", size=size, data=flags_bytes)
 
-    def render_robots(robots: list[Robot]):
-        flags = [[False] * width for _ in range(height)]
-        for robot in robots:
-            flags[robot.pos.y][robot.pos.x] = True
+    image.show()
 
-        flags = np.array(flags)
 
-        size = flags.shape[::-1]
-        flags_bytes = np.packbits(flags, axis=1)
-        image = Image.frombytes(mode="1", size=size, data=flags_bytes)
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
 
-        image.show()
+    lobby = parse(data)
+    print(f"Problem 1: {part1(lobby)}")
+    i_max = part2(lobby)
+    print(f"Problem 2: {i_max}")
 
-    render_robots(states[i_max])
+    if cli.verbose:
+        (robots, width, height) = lobby
+        states = simulate_states(robots, width, height)
+        render_robots(next(itertools.islice(states, i_max, None)), width, height)
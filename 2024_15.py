@@ -1,10 +1,10 @@
-import aocd
 import re
 from enum import Enum
-from typing import NamedTuple
-from tqdm import tqdm as progress
 
 import cli
+import inputs
+from progress import progress
+from vector import Vector
 
 sample_data = """\
 ##########
@@ -28,53 +28,56 @@ vvv<<^>^v^^><<>>><>^<<><^vv^^<>vvv<>><^^v>^>vv<>v<<<<v<^v>^<^^>>>^<v<v
 <><^^>^^^<><vvvvv^v<v<<>^v<v>v<<^><<><<><<<^^<<<^<<>><<><^^^>^^<>^>v<>
 ^^>vv<^v^v<vv>^<><v<^v>^^^>>>^^vvv^>vvv<>>>^<^>>>>>^<<^v>^vvv<>^<><<v>
 v^^>>><<^^<>>^v^<v^vv<>v^<<>^<^v^v><^<<<><<^<v><v<>vv>>v><v^<vv<>v^<<^"""
-data = sample_data if cli.sample else aocd.data
-[floor_plan, moves] = data.split("\n\n")
 
-flat_floor_plan = floor_plan.replace("\n", "")
-floor_plan = list(map(list, floor_plan.splitlines()))
-width = len(floor_plan[0])
-height = len(floor_plan)
+directions = {
+    ">": Vector(+1, 0),
+    "v": Vector(0, +1),
+    "<": Vector(-1, 0),
+    "^": Vector(0, -1),
+}
 
-flat_idx_to_coords = lambda i: Vector(i % width, i // width)
-is_in_range = lambda p: p.x >= 0 and p.y >= 0 and p.x < width and p.y < height
+def print_floor(floor_plan: list[list[str]]):
+    print(f"{"\n".join(map(lambda x: "".join(x), floor_plan))}\n")
 
-moves = "".join(moves.splitlines())
 
+def flat_idx_to_coords(floor_plan: list[list[str]], i: int) -> Vector:
+    width = len(floor_plan[0])
+    return Vector(i % width, i // width)
 
-class Vector(NamedTuple):
-    x: int
-    y: int
 
-    def __add__(lhs, rhs):
-        return Vector(lhs.x + rhs.x, lhs.y + rhs.y)
+def is_in_range(floor_plan: list[list[str]], p: Vector) -> bool:
+    width = len(floor_plan[0])
+    height = len(floor_plan)
+    return p.x >= 0 and p.y >= 0 and p.x < width and p.y < height
 
-    def __sub__(lhs, rhs):
-        return Vector(lhs.x - rhs.x, lhs.y - rhs.y)
 
-    def __mul__(lhs, rhs: int):
-        return Vector(lhs.x * rhs, lhs.y * rhs)
+Warehouse = tuple[list[list[str]], str]
 
-    def __truediv__(lhs, rhs: int):
-        return Vector(lhs.x / rhs, lhs.y / rhs)
 
+def parse(data: str) -> Warehouse:
+    [floor_plan, moves] = data.split("\n\n")
+    floor_plan = list(map(list, floor_plan.splitlines()))
+    moves = "".join(moves.splitlines())
+    return floor_plan, moves
 
-directions = {
-    ">": Vector(+1, 0),
-    "v": Vector(0, +1),
-    "<": Vector(-1, 0),
-    "^": Vector(0, -1),
-}
 
-def print_floor(floor_plan: list[list[str]]):
-    print(f"{"\n".join(map(lambda x: "".join(x), floor_plan))}\n")
+def find_robot(floor_plan: list[list[str]]) -> Vector:
+    flat_floor_plan = "".join(map(lambda x: "".join(x), floor_plan))
+    return flat_idx_to_coords(floor_plan, flat_floor_plan.find("@"))
+
+
+def sum_of_gps_values(floor_plan: list[list[str]], box: str) -> int:
+    flat_floor_plan = "".join(map(lambda x: "".join(x), floor_plan))
+    box_coordinates = map(lambda x: flat_idx_to_coords(floor_plan, x.regs[0][0]), re.finditer(box, flat_floor_plan))
+    gps_values = map(lambda p: 100 * p.y + p.x, box_coordinates)
+    return sum(gps_values)
 
 
 ################################################################################################
 # Problem 1
 def try_move(floor_plan: list[list[str]], pos: Vector, dir: Vector) -> bool:
     target_pos = pos + dir
-    if is_in_range(target_pos):
+    if is_in_range(floor_plan, target_pos):
         target_object = floor_plan[target_pos.y][target_pos.x]
         if target_object == "@":
             raise "Wtf just happened???"
@@ -95,19 +98,17 @@ def try_move(floor_plan: list[list[str]], pos: Vector, dir: Vector) -> bool:
     return False
 
 
-robot_pos = flat_idx_to_coords(flat_floor_plan.find("@"))
-
-result_floor_plan = list(map(list.copy, floor_plan))
-for op in moves:
-    dir = directions[op]
-    if try_move(result_floor_plan, robot_pos, dir):
-        robot_pos = robot_pos + dir
+def part1(warehouse: Warehouse) -> int:
+    (floor_plan, moves) = warehouse
 
-flat_result_floor_plan = "".join(map(lambda x: "".join(x), result_floor_plan))
-box_coordinates = map(lambda x: flat_idx_to_coords(x.regs[0][0]), re.finditer("O", flat_result_floor_plan))
-gps_values = map(lambda p: 100 * p.y + p.x, box_coordinates)
+    result_floor_plan = list(map(list.copy, floor_plan))
+    robot_pos = find_robot(result_floor_plan)
+    for op in moves:
+        dir = directions[op]
+        if try_move(result_floor_plan, robot_pos, dir):
+            robot_pos = robot_pos + dir
 
-print(f"Problem 1: {sum(gps_values)}")
+    return sum_of_gps_values(result_floor_plan, "O")
 
 
 ################################################################################################
@@ -125,15 +126,10 @@ def widen_row(row: list[str]):
         else:
             row[2*i+1:2*i + 1] = obj
     return row
-widened_floor_plan = list(map(widen_row, floor_plan))
 
-width = width * 2
-flat_idx_to_coords = lambda i: Vector(i % width, i // width)
-is_in_range = lambda p: p.x >= 0 and p.y >= 0 and p.x < width and p.y < height
-
-def try_move(floor_plan: list[list[str]], pos: Vector, dir: Vector, dry: bool = False) -> bool:
+def try_move_wide(floor_plan: list[list[str]], pos: Vector, dir: Vector, dry: bool = False) -> bool:
     target_pos = pos + dir
-    if is_in_range(target_pos):
+    if is_in_range(floor_plan, target_pos):
         target_object = floor_plan[target_pos.y][target_pos.x]
         if target_object == "@":
             raise "Wtf just happened???"
@@ -142,7 +138,7 @@ def try_move(floor_plan: list[list[str]], pos: Vector, dir: Vector, dry: bool =
         elif target_object in "[]":
             if dir.y == 0:
                 # moving one half into another, treat like normal
-                if try_move(floor_plan, target_pos, dir, dry):
+                if try_move_wide(floor_plan, target_pos, dir, dry):
                     if not dry:
                         floor_plan[target_pos.y][target_pos.x] = floor_plan[pos.y][pos.x]
                         floor_plan[pos.y][pos.x] = "."
@@ -153,10 +149,10 @@ def try_move(floor_plan: list[list[str]], pos: Vector, dir: Vector, dry: bool =
 
                 # moving only one half up, do a dry run of the other half and if success try moving this half up
                 # if all of that succeeds actually move the other half up
-                other_can_move = try_move(floor_plan, other_half, dir, True)
-                if other_can_move and try_move(floor_plan, target_pos, dir, dry):
+                other_can_move = try_move_wide(floor_plan, other_half, dir, True)
+                if other_can_move and try_move_wide(floor_plan, target_pos, dir, dry):
                     if not dry:
-                        try_move(floor_plan, other_half, dir, False)
+                        try_move_wide(floor_plan, other_half, dir, False)
                         floor_plan[target_pos.y][target_pos.x] = floor_plan[pos.y][pos.x]
                         floor_plan[pos.y][pos.x] = "."
                     return True
@@ -170,23 +166,23 @@ def try_move(floor_plan: list[list[str]], pos: Vector, dir: Vector, dry: bool =
             raise "Bruv..."
     return False
 
-flat_widened_floor_plan = "".join(map(lambda x: "".join(x), widened_floor_plan))
-robot_pos = flat_idx_to_coords(flat_widened_floor_plan.find("@"))
 
-for op in moves:
-    dir = directions[op]
-    if try_move(widened_floor_plan, robot_pos, dir):
-        robot_pos = robot_pos + dir
+def part2(warehouse: Warehouse) -> int:
+    (floor_plan, moves) = warehouse
 
-flat_widened_floor_plan = "".join(map(lambda x: "".join(x), widened_floor_plan))
-box_coordinates = map(lambda x: flat_idx_to_coords(x.regs[0][0]), re.finditer(r"\[\]", flat_widened_floor_plan))
-gps_values = map(lambda p: 100 * p.y + p.x, box_coordinates)
+    widened_floor_plan = list(map(widen_row, floor_plan))
+    robot_pos = find_robot(widened_floor_plan)
+    for op in moves:
+        dir = directions[op]
+        if try_move_wide(widened_floor_plan, robot_pos, dir):
+            robot_pos = robot_pos + dir
+
+    return sum_of_gps_values(widened_floor_plan, r"\[\]")
 
-print(f"Problem 2: {sum(gps_values)}")
 
 ################################################################################################
 # Interactive
-if cli.verbose:
+def interactive(floor_plan: list[list[str]]):
     import os
     import getkey
 
@@ -197,8 +193,7 @@ if cli.verbose:
         DOWN  = 'àP'
 
     widened_floor_plan = list(map(widen_row, floor_plan))
-    flat_widened_floor_plan = "".join(map(lambda x: "".join(x), widened_floor_plan))
-    robot_pos = flat_idx_to_coords(flat_widened_floor_plan.find("@"))
+    robot_pos = find_robot(widened_floor_plan)
 
     print_floor(widened_floor_plan)
 
@@ -215,7 +210,20 @@ if cli.verbose:
                 op = 'v'
                 
         dir = directions[op]
-        if try_move(widened_floor_plan, robot_pos, dir):
+        if try_move_wide(widened_floor_plan, robot_pos, dir):
             robot_pos = robot_pos + dir
         os.system('cls')
         print_floor(widened_floor_plan)
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    warehouse = parse(data)
+    print(f"Problem 1: {part1(warehouse)}")
+    print(f"Problem 2: {part2(warehouse)}")
+
+    if cli.verbose:
+        (floor_plan, _) = warehouse
+        interactive(floor_plan)
@@ -1,12 +1,6 @@
-import aocd
-import math
-import functools
-import itertools
-from typing import NamedTuple
-from heapq import heappop, heappush
-from tqdm import tqdm as progress
-
 import cli
+import inputs
+from progress import progress
 from vector import Vector
 
 sample_data = """\
@@ -27,18 +21,6 @@ sample_data = """\
 #.#.#.#########.#
 #S#.............#
 #################"""
-data = sample_data if cli.sample else aocd.data
-
-flat_maze = data.replace("\n", "")
-maze = list(map(list, data.splitlines()))
-width = len(maze[0])
-height = len(maze)
-
-flat_idx_to_coords = lambda i: Vector(i % width, i // width)
-is_in_range = lambda p: p.x >= 0 and p.y >= 0 and p.x < width and p.y < height
-
-start_pos = flat_idx_to_coords(flat_maze.find("S"))
-end_pos = flat_idx_to_coords(flat_maze.find("E"))
 
 
 def print_maze(maze: list[str]):
@@ -53,95 +35,60 @@ def print_maze_with_solution(maze: list[str], solution: list[Vector]):
     print_maze(maze_with_solution)
 
 
+MazeSetup = tuple[list[list[str]], Vector, Vector]
+
+
+def parse(data: str) -> MazeSetup:
+    flat_maze = data.replace("\n", "")
+    maze = list(map(list, data.splitlines()))
+    width = len(maze[0])
+
+    flat_idx_to_coords = lambda i: Vector(i % width, i // width)
+
+    start_pos = flat_idx_to_coords(flat_maze.find("S"))
+    end_pos = flat_idx_to_coords(flat_maze.find("E"))
+    return maze, start_pos, end_pos
+
+
 ################################################################################################
 # Problem 1
-from astar import AStar
+from astar import GridAStar
 
-directions = [
-    Vector(-1, 0),
-    Vector(+1, 0),
-    Vector(0, -1),
-    Vector(0, +1),
-]
 
+def make_solver(maze: list[list[str]]) -> GridAStar:
+    passable = bytes(tile != "#" for row in maze for tile in row)
+    # we start facing east and every turn costs a thousand points
+    return GridAStar(len(maze[0]), len(maze), passable, turn_cost=1000)
 
-class Solver(AStar):
-    def heuristic_cost_estimate(self, current: Vector, goal: Vector) -> float:
-        diff = current - goal
-        # manhattan distance
-        return abs(diff.x) + abs(diff.y)
 
-    def distance_between(self, n1: Vector, n2: Vector) -> float:
-        previous = self.current.came_from
-        prev_dir = previous.data - n1 if previous else Vector(1, 0)
-        this_dir = n1 - n2
-        if prev_dir != this_dir:
-            return 1001
-        return 1
+def part1(maze_setup: MazeSetup) -> int:
+    (maze, start_pos, end_pos) = maze_setup
 
-    def neighbors(_, node: Vector) -> list[Vector]:
-        return filter(
-            lambda p: maze[p.y][p.x] != "#",
-            filter(
-                is_in_range, map(functools.partial(Vector.__add__, node), directions)
-            ),
-        )
+    solver = make_solver(maze)
+    (solution, cost) = solver.astar(solver.node(*start_pos), solver.node(*end_pos))
+    if cli.verbose:
+        solution = [Vector(*solver.coords(node)) for node in solution]
+        print_maze_with_solution(maze, solution)
 
-
-(solution, cost) = Solver().astar(start_pos, end_pos)
-print_maze_with_solution(maze, solution)
-print(f"Problem 1: {int(cost)}")
+    return cost
 
 
 ################################################################################################
 # Problem 2
-class SearchNode(NamedTuple):
-    pos: Vector
-    dir: Vector
-
-
-class QueueElem(NamedTuple):
-    score: int
-    pos: Vector
-    dir: Vector
-    path: list[Vector]
-
-
-target_score = math.inf
-paths: list[list[Vector]] = []
-
-visited: dict[SearchNode, int] = {}
-queue: list[QueueElem] = [QueueElem(0, start_pos, Vector(1, 0), [])]
-while queue:
-    # arrived at only nodes that are too expensive, call it quits
-    score, pos, dir, path = heappop(queue)
-    if score > target_score:
-        break
-
-    # remember this node
-    node = SearchNode(pos, dir)
-    if node in visited and visited[node] < score:
-        continue
-    visited[node] = score
-
-    # push forward option
-    next = pos + dir
-    if maze[next.y][next.x] != "#":
-        heappush(queue, QueueElem(score + 1, next, dir, path + [pos]))
-
-    # push turn-left option
-    left_dir = Vector(dir.y, -dir.x)
-    heappush(queue, QueueElem(score + 1000, pos, left_dir, path))
-
-    # push turn-right option
-    right_dir = Vector(-dir.y, dir.x)
-    heappush(queue, QueueElem(score + 1000, pos, right_dir, path))
-
-    # if we arrived at the end, store this as a path
-    # and rememeber its score to quit when we get past it
-    if pos == end_pos:
-        target_score = score
-        paths.append(path + [end_pos])
-
-unique_points = set(itertools.chain.from_iterable(paths))
-print(f"Problem 2: {len(unique_points)}")
+def part2(maze_setup: MazeSetup) -> int:
+    (maze, start_pos, end_pos) = maze_setup
+
+    solver = make_solver(maze)
+    (tiles, _) = solver.all_optimal_paths(
+        solver.node(*start_pos), solver.node(*end_pos)
+    )
+    return len(tiles)
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    maze_setup = parse(data)
+    print(f"Problem 1: {part1(maze_setup)}")
+    print(f"Problem 2: {part2(maze_setup)}")
@@ -1,9 +1,9 @@
-import aocd
 import re
 import abc
-from tqdm import tqdm as progress
 
 import cli
+import inputs
+from progress import progress
 
 sample_data = """\
 Register A: 729
@@ -11,9 +11,11 @@ Register B: 0
 Register C: 0
 
 Program: 0,1,5,4,3,0"""
-data = sample_data if cli.sample else aocd.data
 
-[registers, program] = data.split("\n\n")
+
+def parse(data: str) -> tuple[str, str]:
+    [registers, program] = data.split("\n\n")
+    return registers, program.removeprefix("Program: ")
 
 
 class Machine:
@@ -195,12 +197,18 @@ def execute(program: Program, machine: Machine, generate_disasm: bool = False):
     return machine.out, full_disasm
 
 
-machine = Machine(registers.splitlines())
-program = Program(program.removeprefix("Program: "))
-out, disasm = execute(program, machine, generate_disasm=True)
+def part1(computer: tuple[str, str]) -> str:
+    (registers, octal_code) = computer
+
+    machine = Machine(registers.splitlines())
+    program = Program(octal_code)
+    out, disasm = execute(program, machine, generate_disasm=cli.verbose)
+
+    if cli.verbose:
+        print("Disasm:\n\t" + "\n\t".join(disasm))
+
+    return ",".join(out)
 
-print("Disasm:\n\t" + "\n\t".join(disasm))
-print("Output:\n\t" + ",".join(out))
 
 ################################################################################################
 # Problem 2
@@ -211,7 +219,7 @@ print("Output:\n\t" + ",".join(out))
 # - so we can find chains of octals by starting from the left-most octal
 
 
-def solve_for_specific_ram(ram: int):
+def solve_for_specific_ram(registers: str, program: Program, ram: int):
     machine = Machine(registers.splitlines())
     machine.ram = ram
 
@@ -220,27 +228,43 @@ def solve_for_specific_ram(ram: int):
     return out
 
 
-possible_values: list[int] = [0]
-for op in progress(list(reversed(program.octals))):
-    new_values = []
-    for base_ram in possible_values:
-        # shift to make space for fresh octals
-        base_ram <<= 3
+def part2(computer: tuple[str, str]) -> int:
+    (registers, octal_code) = computer
+
+    program = Program(octal_code)
+    possible_values: list[int] = [0]
+    for op in progress(list(reversed(program.octals))):
+        new_values = []
+        for base_ram in possible_values:
+            # shift to make space for fresh octals
+            base_ram <<= 3
+
+            # get a list of the eight possible values to extend this potential solution
+            extended_rams = list(map(lambda j: base_ram | j, range(0, 8)))
+
+            # compute these eight programs and see what eight outputs they add
+            output_map = list(
+                map(
+                    lambda o: int(solve_for_specific_ram(registers, program, o)[0]),
+                    extended_rams,
+                )
+            )
+
+            # for each one that has the desired output add it to the list of potential solutions
+            indices = [i for i, o in enumerate(output_map) if o == op]
+            for j in indices:
+                new_values.append(base_ram | j)
 
-        # get a list of the eight possible values to extend this potential solution
-        extended_rams = list(map(lambda j: base_ram | j, range(0, 8)))
+        possible_values = new_values
 
-        # compute these eight programs and see what eight outputs they add
-        output_map = list(
-            map(lambda o: int(solve_for_specific_ram(o)[0]), extended_rams)
-        )
+    # we have a set of solutions now, the problem asks for the smallest
+    return min(possible_values)
 
-        # for each one that has the desired output add it to the list of potential solutions
-        indices = [i for i, o in enumerate(output_map) if o == op]
-        for j in indices:
-            new_values.append(base_ram | j)
 
-    possible_values = new_values
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
 
-# we have a set of solutions now, the problem asks for the smallest
-print(f"Problem 2: {min(possible_values)}")
+    computer = parse(data)
+    print(f"Problem 1: {part1(computer)}")
+    print(f"Problem 2: {part2(computer)}")
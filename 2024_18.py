@@ -1,13 +1,13 @@
-import aocd
 import re
-import functools
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
 from heapq import heappop, heappush
-from tqdm import tqdm as progress
 
 import cli
+import inputs
 from vector import Vector
-from astar import AStar
+from astar import GridAStar
+from unionfind import UnionFind
+from progress import progress
 
 sample_data = """\
 5,4
@@ -35,23 +35,22 @@ sample_data = """\
 0,5
 1,6
 2,0"""
-data = sample_data if cli.sample else aocd.data
 
-width = 7 if cli.sample else 71
-height = width
-world = [[None] * width for _ in range(height)]
+World = list[int | None]
+Path = list[Vector]
+MemorySpace = tuple[World, list[tuple[str, str]]]
 
-is_in_range = lambda p: p.x >= 0 and p.y >= 0 and p.x < width and p.y < height
 
-start_pos = Vector(0, 0)
-end_pos = Vector(width - 1, height - 1)
+def parse(data: str) -> MemorySpace:
+    width = 7 if cli.sample else 71
+    height = width
+    world = [[None] * width for _ in range(height)]
 
-bytes = list(map(lambda l: re.match(r"(\d+),(\d+)", l).groups(), data.splitlines()))
-for i, (x, y) in enumerate(bytes):
-    world[int(y)][int(x)] = i + 1
+    bytes = list(map(lambda l: re.match(r"(\d+),(\d+)", l).groups(), data.splitlines()))
+    for i, (x, y) in enumerate(bytes):
+        world[int(y)][int(x)] = i + 1
 
-World = list[int | None]
-Path = list[Vector]
+    return world, bytes
 
 
 def print_world(world: World | list[str | None], time: int):
@@ -139,66 +138,99 @@ def print_world_with_solution(world: World, solution: Path, time: int):
 
 #     return paths
 
-directions = [
-    Vector(-1, 0),
-    Vector(+1, 0),
-    Vector(0, -1),
-    Vector(0, +1),
-]
-
 
-class Solver(AStar):
-    def __init__(self, fixed_time: int | None):
-        super().__init__()
+def find_path(world: World, time: int) -> Path | None:
+    width = len(world[0])
+    height = len(world)
 
-        self.fixed_time = fixed_time
+    # every byte that fell until this time blocks its tile
+    passable = bytes(tile is None or tile > time for row in world for tile in row)
+    solver = GridAStar(width, height, passable)
+    solution = solver.astar(solver.node(0, 0), solver.node(width - 1, height - 1))
+    if solution is None:
+        return None
 
-    def heuristic_cost_estimate(self, current: Vector, goal: Vector) -> float:
-        diff = current - goal
-        # manhattan distance
-        return abs(diff.x) + abs(diff.y)
-
-    def distance_between(self, _: Vector, __: Vector) -> float:
-        return 1
-
-    def neighbors(self, node: Vector) -> list[Vector]:
-        time = self.fixed_time if self.fixed_time else int(self.current.gscore)
-        return filter(
-            lambda p: world[p.y][p.x] > time if world[p.y][p.x] else True,
-            filter(
-                is_in_range, map(functools.partial(Vector.__add__, node), directions)
-            ),
-        )
+    (path, _) = solution
+    return [Vector(*solver.coords(node)) for node in path]
 
 
 ################################################################################################
 # Problem 1
-fixed_time = 12 if cli.sample else 1024
-print_world(world, fixed_time)
+def part1(memory_space: MemorySpace) -> int:
+    (world, _) = memory_space
+
+    fixed_time = 12 if cli.sample else 1024
+    if cli.verbose:
+        print_world(world, fixed_time)
 
-(path, cost) = Solver(fixed_time).astar(start_pos, end_pos)
-print_world_with_solution(world, path, fixed_time)
+    path = find_path(world, fixed_time)
+    if cli.verbose:
+        print_world_with_solution(world, path, fixed_time)
+
+    # path contains start_pos which we don't count as a step
+    return len(path) - 1
 
-# path contains start_pos which we don't count as a step
-print(f"Problem 1: {len(path) - 1}")
 
 ################################################################################################
 # Problem 2
-
-# binary search the problem space
-bot_time = 0
-top_time = len(bytes)
-while True:
-    mid_time = bot_time + (top_time - bot_time) // 2
-    if Solver(mid_time).astar(start_pos, end_pos):
-        bot_time = mid_time + 1
-    else:
-        top_time = mid_time - 1
-
-    if bot_time >= top_time:
-        break
-
-blocking_time = mid_time + 1 if Solver(mid_time).astar(start_pos, end_pos) else mid_time
-blocking_byte = bytes[blocking_time - 1]
-blocking_byte = Vector(int(blocking_byte[0]), int(blocking_byte[1]))
-print(f"Problem 2: {blocking_byte}")
+# Instead of searching for a path after every byte, we track the fallen bytes themselves. The
+# way from the top-left to the bottom-right corner is cut off exactly when a chain of bytes,
+# touching diagonally counts, connects the top or right edge with the left or bottom edge.
+# Bytes can be added one at a time and each only costs a few union-find operations.
+class MemoryBarrier:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.corrupted = bytearray(width * height)
+
+        # two extra sets for the edges
+        self.top_right = width * height
+        self.bottom_left = width * height + 1
+        self.sets = UnionFind(width * height + 2)
+
+    def add_byte(self, x: int, y: int) -> bool:
+        """Adds a fallen byte, returns whether the exit is now cut off"""
+        (width, height) = (self.width, self.height)
+        cell = y * width + x
+        self.corrupted[cell] = 1
+
+        if y == 0 or x == width - 1:
+            self.sets.union(cell, self.top_right)
+        if x == 0 or y == height - 1:
+            self.sets.union(cell, self.bottom_left)
+
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                (nx, ny) = (x + dx, y + dy)
+                if 0 <= nx < width and 0 <= ny < height:
+                    if self.corrupted[ny * width + nx]:
+                        self.sets.union(cell, ny * width + nx)
+
+        return self.is_blocked()
+
+    def is_blocked(self) -> bool:
+        return self.sets.connected(self.top_right, self.bottom_left)
+
+
+def find_blocking_byte(
+    width: int, height: int, bytes: Iterable[tuple[str, str]]
+) -> Vector | None:
+    barrier = MemoryBarrier(width, height)
+    for x, y in bytes:
+        if barrier.add_byte(int(x), int(y)):
+            return Vector(int(x), int(y))
+    return None
+
+
+def part2(memory_space: MemorySpace) -> Vector:
+    (world, bytes) = memory_space
+    return find_blocking_byte(len(world[0]), len(world), bytes)
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    memory_space = parse(data)
+    print(f"Problem 1: {part1(memory_space)}")
+    print(f"Problem 2: {part2(memory_space)}")
@@ -1,13 +1,13 @@
-import aocd
 import math
 import functools
 from typing import NamedTuple
 
 # from heapq import heappop, heappush
 from sortedcontainers import SortedList
-from tqdm import tqdm as progress
 
 import cli
+import inputs
+from progress import progress
 from vector import Vector
 
 sample_data = """\
@@ -21,11 +21,13 @@ ubwu
 bwurrg
 brgr
 bbrgwb"""
-data = sample_data if cli.sample else aocd.data
 
-towels, patterns = data.split("\n\n")
-towels = tuple(reversed(sorted(towels.split(", "), key=lambda t: len(t))))
-patterns = patterns.splitlines()
+
+def parse(data: str) -> tuple[tuple[str], list[str]]:
+    towels, patterns = data.split("\n\n")
+    towels = tuple(reversed(sorted(towels.split(", "), key=lambda t: len(t))))
+    patterns = patterns.splitlines()
+    return towels, patterns
 
 
 @functools.cache
@@ -48,16 +50,31 @@ def count_towel_combinations(towels: tuple[str], pattern: str) -> int:
     return count_towel_combinations(eligible_towels, pattern)
 
 
-towel_combinations = list(
-    map(functools.partial(count_towel_combinations, towels), progress(patterns))
-)
-towel_combinations = list(filter(None, towel_combinations))
+def count_all_towel_combinations(towels: tuple[str], patterns: list[str]) -> list[int]:
+    towel_combinations = list(
+        map(functools.partial(count_towel_combinations, towels), progress(patterns))
+    )
+    return list(filter(None, towel_combinations))
+
 
 ################################################################################################
 # Problem 1
-print(f"Problem 1: {len(towel_combinations)}")
+def part1(onsen: tuple[tuple[str], list[str]]) -> int:
+    towel_combinations = count_all_towel_combinations(*onsen)
+    return len(towel_combinations)
 
 
 ################################################################################################
 # Problem 2
-print(f"Problem 1: {sum(towel_combinations)}")
+def part2(onsen: tuple[tuple[str], list[str]]) -> int:
+    towel_combinations = count_all_towel_combinations(*onsen)
+    return sum(towel_combinations)
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    onsen = parse(data)
+    print(f"Problem 1: {part1(onsen)}")
+    print(f"Problem 2: {part2(onsen)}")
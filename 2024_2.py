@@ -1,8 +1,8 @@
-import aocd
-import collections
+import mmap
 import itertools
 
 import cli
+import inputs
 
 sample_data = """\
 7 6 4 2 1
@@ -11,69 +11,142 @@ sample_data = """\
 1 3 2 4 5
 8 6 4 4 1
 1 3 6 7 9"""
-data = sample_data if cli.sample else aocd.data
-
-reports = [[int(n) for n in l.split()] for l in data.splitlines()]
-
-
-def is_report_safe(report, with_dampener=False):
-    def sliding_window(iterable, n):
-        iterator = iter(iterable)
-        window = collections.deque(itertools.islice(iterator, n - 1), maxlen=n)
-        for x in iterator:
-            window.append(x)
-            yield tuple(window)
-
-    def try_dampen(i):
-        # strip off left level
-        left_stripped = report.copy()
-        del left_stripped[i]
-        if is_report_safe(left_stripped):
-            return i
-
-        # strip off right level
-        right_stripped = report.copy()
-        del right_stripped[i + 1]
-        if is_report_safe(right_stripped):
-            return i + 1
-
-        # strip off first level
-        first_stripped = report.copy()
-        del first_stripped[0]
-        if is_report_safe(first_stripped):
-            return 0
-
-        # strip off second level
-        second_stripped = report.copy()
-        del second_stripped[1]
-        if is_report_safe(second_stripped):
-            return 1
-
-        return False
-
-    last_diff = 0
-    for i, [lhs, rhs] in enumerate(sliding_window(report, 2)):
-        diff = rhs - lhs
-        if abs(diff) < 1 or abs(diff) > 3:
-            return try_dampen(i) if with_dampener else False
-        if last_diff != 0 and last_diff / diff < 0:
-            return try_dampen(i) if with_dampener else False
-        last_diff = diff
-
-    return True
-
-
-report_safeties = [is_report_safe(report) for report in reports]
-safe_reports = [report for i, report in enumerate(reports) if report_safeties[i]]
-print(f"Problem 1: {len(safe_reports)}")
-
-dampened_report_safeties = [is_report_safe(report, True) for report in reports]
-dampened_safe_reports = [
-    report for i, report in enumerate(reports) if dampened_report_safeties[i]
-]
-print(f"Problem 2: {len(dampened_safe_reports)}")
-
-if cli.visualize:
+
+
+def parse(data: str) -> list[list[int]]:
+    return [[int(n) for n in l.split()] for l in data.splitlines()]
+
+
+def is_step_safe(lhs: int, rhs: int, sign: int) -> bool:
+    return 1 <= (rhs - lhs) * sign <= 3
+
+
+def check_direction(report: list[int], sign: int, with_dampener: bool) -> bool | int:
+    """
+    Checks in a single pass whether the report steps safely in the direction of `sign`.
+    With the dampener it also tracks the ways one removed level can still get there, which
+    end either in the current level or in the one before it, with the current one removed.
+    Returns True if the report is safe as is, else the index of a level whose removal makes
+    it safe, else False.
+    """
+    safe = True
+    # (last kept level or None if there is none yet, index of the removed level)
+    dampened: list[tuple[int | None, int]] = [(None, 0)] if with_dampener else []
+    for i in range(1, len(report)):
+        (last, level) = (report[i - 1], report[i])
+
+        next_dampened = []
+        for dampened_last, removed in dampened:
+            if dampened_last is None or is_step_safe(dampened_last, level, sign):
+                next_dampened.append((level, removed))
+                break
+        if safe and with_dampener:
+            next_dampened.append((last, i))
+
+        safe = safe and is_step_safe(last, level, sign)
+        dampened = next_dampened
+        if not safe and not dampened:
+            return False
+
+    return True if safe else dampened[0][1]
+
+
+def is_report_safe(report: list[int], with_dampener: bool = False) -> bool | int:
+    # careful, a report can be fixed by removing level 0
+    dampened = False
+    for sign in (1, -1):
+        safety = check_direction(report, sign, with_dampener)
+        if safety is True:
+            return True
+        if dampened is False:
+            dampened = safety
+    return dampened
+
+
+################################################################################################
+# NumPy, checking many reports at once with them padded to the same length
+def pad_reports(numbers, lengths):
+    import numpy as np
+
+    levels = np.zeros((len(lengths), lengths.max(initial=0)), dtype=np.int64)
+    levels[np.arange(levels.shape[1]) < lengths[:, None]] = numbers
+    return levels, lengths
+
+
+def to_padded_array(reports: list[list[int]]):
+    import numpy as np
+
+    lengths = np.fromiter(map(len, reports), dtype=np.int64, count=len(reports))
+    numbers = np.fromiter(itertools.chain.from_iterable(reports), dtype=np.int64)
+    return pad_reports(numbers, lengths)
+
+
+def parse_padded(chunk: bytes):
+    """Tokenizes whole lines of raw input into padded reports without Python ints"""
+    import numpy as np
+
+    numbers = np.fromstring(chunk, dtype=np.int64, sep=" ")
+
+    # count the numbers on each line by where they start
+    text = np.frombuffer(chunk, dtype=np.uint8)
+    is_digit = (text >= ord("0")) & (text <= ord("9"))
+    starts = is_digit.copy()
+    starts[1:] &= ~is_digit[:-1]
+    lines = np.cumsum(text == ord("\n")) - (text == ord("\n"))
+    lengths = np.bincount(lines[starts], minlength=lines[-1] + 1 if len(lines) else 0)
+    return pad_reports(numbers, lengths[lengths > 0])
+
+
+def safe_reports_mask(levels, lengths):
+    import numpy as np
+
+    steps = np.diff(levels, axis=1)
+    # steps into the padding always pass
+    padding = np.arange(steps.shape[1]) >= (lengths - 1)[:, None]
+    increasing = ((steps >= 1) & (steps <= 3)) | padding
+    decreasing = ((steps <= -1) & (steps >= -3)) | padding
+    return increasing.all(axis=1) | decreasing.all(axis=1)
+
+
+def dampened_safe_reports_mask(levels, lengths):
+    import numpy as np
+
+    safe = safe_reports_mask(levels, lengths)
+    for i in range(levels.shape[1]):
+        removed = np.delete(levels, i, axis=1)
+        safe |= safe_reports_mask(removed, lengths - (i < lengths))
+    return safe
+
+
+def count_safe_reports(raw: mmap.mmap | bytes) -> tuple[int, int]:
+    """
+    Safe reports without and with the dampener, read from raw input in chunks of lines,
+    so that the memory needed doesn't grow with the number of reports.
+    """
+    safe = 0
+    dampened_safe = 0
+    for chunk in inputs.iter_line_chunks(raw, 1 << 20):
+        (levels, lengths) = parse_padded(chunk)
+        safe += int(safe_reports_mask(levels, lengths).sum())
+        dampened_safe += int(dampened_safe_reports_mask(levels, lengths).sum())
+    return safe, dampened_safe
+
+
+################################################################################################
+# Problem 1
+def part1(reports: list[list[int]]) -> int:
+    (levels, lengths) = to_padded_array(reports)
+    return int(safe_reports_mask(levels, lengths).sum())
+
+
+################################################################################################
+# Problem 2
+def part2(reports: list[list[int]]) -> int:
+    (levels, lengths) = to_padded_array(reports)
+    return int(dampened_safe_reports_mask(levels, lengths).sum())
+
+
+def visualize(reports: list[list[int]]):
     import manim
     import numpy
     import pathlib
@@ -100,8 +173,9 @@ if cli.visualize:
             + reports[-reduced_number_reports // 2 :]
         )
         random.shuffle(reports)
-        report_safeties = [is_report_safe(report) for report in reports]
-        dampened_report_safeties = [is_report_safe(report, True) for report in reports]
+
+    report_safeties = [is_report_safe(report) for report in reports]
+    dampened_report_safeties = [is_report_safe(report, True) for report in reports]
 
     report_lengths = [len(report) for report in reports]
     report_ranges = [(min(report), max(report)) for report in reports]
@@ -270,3 +344,18 @@ if cli.visualize:
     if cli.sample:
         manim.config.output_file = f"{manim.config.output_file}_sample"
     ReportsScene().render()
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    if cli.sample or cli.visualize:
+        reports = parse(sample_data if cli.sample else inputs.get_data(cli.day))
+        (safe, dampened_safe) = (part1(reports), part2(reports))
+    else:
+        # checks the reports chunk by chunk as they are read
+        (safe, dampened_safe) = count_safe_reports(inputs.get_bytes(cli.day))
+    print(f"Problem 1: {safe}")
+    print(f"Problem 2: {dampened_safe}")
+
+    if cli.visualize:
+        visualize(reports)
@@ -1,10 +1,13 @@
-import aocd
 import math
+from array import array
 from typing import NamedTuple
 from heapq import heappop, heappush
 
 import cli
-from vector import Vector
+import inputs
+import metrics
+from vector import Packing, Vector
+from astar import GridAStar
 
 sample_data = """\
 ###############
@@ -22,22 +25,10 @@ sample_data = """\
 #.#.#.#.#.#.###
 #...#...#...###
 ###############"""
-data = sample_data if cli.sample else aocd.data
-
-flat_maze = data.replace("\n", "")
-maze = list(map(list, data.splitlines()))
-width = len(maze[0])
-height = len(maze)
-
-flat_idx_to_coords = lambda i: Vector(i % width, i // width)
-is_in_range = lambda p: p.x >= 0 and p.y >= 0 and p.x < width and p.y < height
-
-start_pos = flat_idx_to_coords(flat_maze.find("S"))
-end_pos = flat_idx_to_coords(flat_maze.find("E"))
-
 
 Maze = list[list[str]]
 Path = list[Vector]
+Racetrack = tuple[Maze, Vector, Vector]
 
 
 class CheatPath(NamedTuple):
@@ -54,6 +45,18 @@ directions = [
 ]
 
 
+def parse(data: str) -> Racetrack:
+    flat_maze = data.replace("\n", "")
+    maze = list(map(list, data.splitlines()))
+    width = len(maze[0])
+
+    flat_idx_to_coords = lambda i: Vector(i % width, i // width)
+
+    start_pos = flat_idx_to_coords(flat_maze.find("S"))
+    end_pos = flat_idx_to_coords(flat_maze.find("E"))
+    return maze, start_pos, end_pos
+
+
 def print_maze(maze: Maze):
     maze_str = "\n".join(map(lambda x: "".join(x), maze))
     print(f"{maze_str}\n")
@@ -93,13 +96,21 @@ def dfs(
         pos: Vector
         path: Path
 
+    width = len(maze[0])
+    height = len(maze)
+    is_in_range = lambda p: p.x >= 0 and p.y >= 0 and p.x < width and p.y < height
+
     paths: list[CheatPath] = []
 
     visited: dict[SearchNode, int] = {}
     target_score: float = math.inf
 
     queue: list[QueueElem] = [QueueElem(0, start_pos, [])]
+    track = metrics.enabled
+    pushes = stale_pops = peak = 0
     while queue:
+        if track:
+            peak = max(peak, len(queue))
         # arrived at only nodes that are too expensive, call it quits
         score, pos, path = heappop(queue)
         if score > target_score:
@@ -108,6 +119,8 @@ def dfs(
         # remember this node
         node = SearchNode(pos)
         if node in visited and visited[node] < score:
+            if track:
+                stale_pops += 1
             continue
         visited[node] = score
 
@@ -117,6 +130,8 @@ def dfs(
             target_score = score
             if not allow_cheats:
                 valid_path = path + [end_pos]
+                if track:
+                    report_dfs_metrics(pushes, stale_pops, peak)
                 return valid_path
 
         # push all directions
@@ -126,6 +141,8 @@ def dfs(
                 next_tile = maze[next.y][next.x]
                 if next_tile != "#":
                     heappush(queue, QueueElem(score + 1, next, path + [pos]))
+                    if track:
+                        pushes += 1
                 elif allow_cheats:
                     for cheat_dir in directions:
                         cheat_next = next + cheat_dir
@@ -140,63 +157,90 @@ def dfs(
                                 )
                                 paths.append(cheated_path)
 
+    if track:
+        report_dfs_metrics(pushes, stale_pops, peak)
     return paths if allow_cheats else None
 
 
-regular_path = dfs(maze, start_pos, end_pos)
-regular_score = len(regular_path) - 1
+def report_dfs_metrics(pushes: int, stale_pops: int, peak: int) -> None:
+    metrics.count("day20.dfs.searches")
+    metrics.count("day20.dfs.pushes", pushes)
+    metrics.count("day20.dfs.stale_pops", stale_pops)
+    metrics.maximum("day20.dfs.queue_peak", peak)
 
-partial_paths = {pos: regular_path[i:] for i, pos in enumerate(regular_path)}
 
-if cli.sample:
-    print_maze_with_solution(maze, regular_path)
-    cheated_paths = dfs(
-        maze,
-        start_pos,
-        end_pos,
-        allow_cheats=True,
-        partial_paths=partial_paths,
-        max_score=regular_score,
-    )
-    for score, path, cheat_pos in reversed(sorted(cheated_paths)):
-        print(cheat_pos, score)
-        print_maze_with_solution(maze, path, cheat_pos=cheat_pos)
+def find_regular_path(racetrack: Racetrack) -> Path:
+    (maze, start_pos, end_pos) = racetrack
+
+    passable = bytes(tile != "#" for row in maze for tile in row)
+    solver = GridAStar(len(maze[0]), len(maze), passable)
+    (path, _) = solver.astar(solver.node(*start_pos), solver.node(*end_pos))
+    return [Vector(*solver.coords(node)) for node in path]
+
+
+def part1(racetrack: Racetrack) -> int:
+    (maze, start_pos, end_pos) = racetrack
+
+    regular_path = find_regular_path(racetrack)
+    regular_score = len(regular_path) - 1
+
+    partial_paths = {pos: regular_path[i:] for i, pos in enumerate(regular_path)}
 
-    print(f"Problem 1: {len(cheated_paths)}")
-else:
+    # on the sample every cheat counts, otherwise it has to save at least 100 picoseconds
     cheated_paths = dfs(
         maze,
         start_pos,
         end_pos,
         allow_cheats=True,
         partial_paths=partial_paths,
-        max_score=regular_score - 99,
+        max_score=regular_score if cli.sample else regular_score - 99,
     )
-    print(f"Problem 1: {len(cheated_paths)}")
 
+    if cli.verbose:
+        print_maze_with_solution(maze, regular_path)
+        for score, path, cheat_pos in reversed(sorted(cheated_paths)):
+            print(cheat_pos, score)
+            print_maze_with_solution(maze, path, cheat_pos=cheat_pos)
 
-################################################################################################
-# Problem 2
-partial_scores = {pos: len(path) for pos, path in partial_paths.items()}
-
-num_cheats: int = 0
-cheat_margin = 99
-for i, pos in enumerate(regular_path):
-    # can't cheat more than 100 points unless the target is at least 100 away
-    possible_targets = regular_path[i + 100 :]
-
-    for target_pos in possible_targets:
-        # if we are further than 20 steps away we can't reach this via cheating
-        dist = pos.manhattan_dist(target_pos)
-        if dist > 20:
-            continue
+    return len(cheated_paths)
 
-        # the score of this cheated path can be computed from the partial paths
-        cheated_score = i + dist + partial_scores[target_pos]
-        if cheated_score > regular_score - cheat_margin:
-            continue
 
-        # found a cheat that is fast enough  🙌
-        num_cheats += 1
-
-print(f"Problem 2: {num_cheats}")
+################################################################################################
+# Problem 2
+def part2(racetrack: Racetrack) -> int:
+    (maze, _, _) = racetrack
+    packing = Packing(len(maze[0]), len(maze))
+    regular_path = [packing.pack(*pos) for pos in find_regular_path(racetrack)]
+
+    # how many steps into the regular path each position is, -1 if it is not on it
+    steps_to = array("l", [-1]) * (packing.width * packing.height)
+    for i, pos in enumerate(regular_path):
+        steps_to[pos] = i
+
+    # instead of comparing all pairs of positions on the path, look only at those within
+    # 20 steps, they are the only ones a cheat can reach
+    max_cheat = 20
+    min_saving = 100
+    num_cheats: int = 0
+    for i, pos in enumerate(regular_path):
+        (x, y) = packing.unpack(pos)
+        for dy in range(
+            max(-max_cheat, -y), min(max_cheat, packing.height - 1 - y) + 1
+        ):
+            reach = max_cheat - abs(dy)
+            row = pos + dy * packing.stride
+            for dx in range(max(-reach, -x), min(reach, packing.width - 1 - x) + 1):
+                # the cheat skips everything between the two positions except its own steps
+                if steps_to[row + dx] - i - abs(dx) - abs(dy) >= min_saving:
+                    num_cheats += 1
+
+    return num_cheats
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    racetrack = parse(data)
+    print(f"Problem 1: {part1(racetrack)}")
+    print(f"Problem 2: {part2(racetrack)}")
@@ -1,9 +1,9 @@
-import aocd
 import functools
 import itertools
 from frozendict import frozendict
 
 import cli
+import inputs
 from vector import Vector
 
 sample_data = """\
@@ -12,9 +12,6 @@ sample_data = """\
 179A
 456A
 379A"""
-data = sample_data if cli.sample else aocd.data
-
-codes = data.splitlines()
 
 directions = frozendict(
     {
@@ -57,6 +54,10 @@ robot_pad: KeyPad = frozendict(
 robot_start = "A"
 
 
+def parse(data: str) -> list[Code]:
+    return data.splitlines()
+
+
 @functools.cache
 def get_possible_paths(pad: KeyPad, pos: Vector, target: Vector) -> list[Code]:
     if pos == target:
@@ -133,13 +134,24 @@ def calc_complexity(code: Code, input_cost: int) -> int:
 
 ################################################################################################
 # Problem 1
-manual_inputs = list(map(functools.partial(get_best_manual_input_cost, 3), codes))
-complexities = list(itertools.starmap(calc_complexity, zip(codes, manual_inputs)))
-print(f"Problem 1: {sum(complexities)}")
+def part1(codes: list[Code]) -> int:
+    manual_inputs = list(map(functools.partial(get_best_manual_input_cost, 3), codes))
+    complexities = list(itertools.starmap(calc_complexity, zip(codes, manual_inputs)))
+    return sum(complexities)
 
 
 ################################################################################################
 # Problem 2
-manual_inputs = list(map(functools.partial(get_best_manual_input_cost, 26), codes))
-complexities = list(itertools.starmap(calc_complexity, zip(codes, manual_inputs)))
-print(f"Problem 1: {sum(complexities)}")
+def part2(codes: list[Code]) -> int:
+    manual_inputs = list(map(functools.partial(get_best_manual_input_cost, 26), codes))
+    complexities = list(itertools.starmap(calc_complexity, zip(codes, manual_inputs)))
+    return sum(complexities)
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    codes = parse(data)
+    print(f"Problem 1: {part1(codes)}")
+    print(f"Problem 2: {part2(codes)}")
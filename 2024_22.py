@@ -1,8 +1,8 @@
-import aocd
 import functools
-from tqdm import tqdm as progress
 
 import cli
+import inputs
+from progress import progress
 
 
 @functools.cache
@@ -13,6 +13,10 @@ def trans(val: int) -> int:
     return val
 
 
+def parse(data: str) -> list[int]:
+    return list(map(int, data.splitlines()))
+
+
 ################################################################################################
 # Problem 1
 sample_data = """\
@@ -20,8 +24,6 @@ sample_data = """\
 10
 100
 2024"""
-data = sample_data if cli.sample else aocd.data
-initial_values = list(map(int, data.splitlines()))
 
 
 @functools.cache
@@ -31,21 +33,20 @@ def calculate_nth_trans(val: int, n: int) -> int:
     return val
 
 
-values_2000th = list(
-    map(functools.partial(calculate_nth_trans, n=2000), progress(initial_values))
-)
-print(f"Problem 1: {sum(values_2000th)}")
+def part1(initial_values: list[int]) -> int:
+    values_2000th = list(
+        map(functools.partial(calculate_nth_trans, n=2000), progress(initial_values))
+    )
+    return sum(values_2000th)
 
 
 ################################################################################################
 # Problem 2
-sample_data = """\
+sample_data_2 = """\
 1
 2
 3
 2024"""
-data = sample_data if cli.sample else aocd.data
-initial_values = list(map(int, data.splitlines()))
 
 
 type TransList = list[int]
@@ -103,17 +104,30 @@ def find_best_trans_diff_sequence(
     return max_key, accumulated_trans_diff_sequence_map[max_key]
 
 
-trans_2000th = list(
-    map(
-        functools.partial(calculate_trans_list_to_nth, n=2000), progress(initial_values)
+def part2(initial_values: list[int]) -> int:
+    trans_2000th = list(
+        map(
+            functools.partial(calculate_trans_list_to_nth, n=2000),
+            progress(initial_values),
+        )
+    )
+    diffs_2000th = list(map(calculate_trans_diffs, progress(trans_2000th)))
+    sequence_maps_200th = compute_trans_diff_sequence_maps(
+        progress(trans_2000th), diffs_2000th
     )
-)
-diffs_2000th = list(map(calculate_trans_diffs, progress(trans_2000th)))
-sequence_maps_200th = compute_trans_diff_sequence_maps(
-    progress(trans_2000th), diffs_2000th
-)
-best_sequence, best_reward = find_best_trans_diff_sequence(
-    progress(sequence_maps_200th)
-)
-
-print(f"Problem 2: {best_reward}")
+    best_sequence, best_reward = find_best_trans_diff_sequence(
+        progress(sequence_maps_200th)
+    )
+    return best_reward
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    initial_values = parse(data)
+    print(f"Problem 1: {part1(initial_values)}")
+
+    if cli.sample:
+        initial_values = parse(sample_data_2)
+    print(f"Problem 2: {part2(initial_values)}")
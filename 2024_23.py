@@ -1,8 +1,8 @@
-import aocd
 from typing import DefaultDict
-from tqdm import tqdm as progress
 
 import cli
+import inputs
+from progress import progress
 
 
 sample_data = """\
@@ -38,37 +38,47 @@ co-tc
 wh-qp
 tb-vc
 td-yn"""
-data = sample_data if cli.sample else aocd.data
 
-connections = DefaultDict[str, list[str]](lambda: [])
-for l in data.splitlines():
-    [f, t] = l.split("-")
-    connections[f].append(t)
-    connections[t].append(f)
+
+def parse(data: str) -> DefaultDict[str, list[str]]:
+    connections = DefaultDict[str, list[str]](lambda: [])
+    for l in data.splitlines():
+        [f, t] = l.split("-")
+        connections[f].append(t)
+        connections[t].append(f)
+    return connections
+
 
 ################################################################################################
 # Problem 1
-t_devices = list(filter(lambda d: d[0] == "t", connections.keys()))
+def find_t_three_networks(
+    connections: DefaultDict[str, list[str]]
+) -> set[tuple[str, str, str]]:
+    t_devices = list(filter(lambda d: d[0] == "t", connections.keys()))
 
-three_networks: set[tuple[str, str, str]] = set()
-for first_device in progress(t_devices):
-    for second_device in connections[first_device]:
-        for third_device in connections[second_device]:
-            if third_device == first_device:
-                continue
+    three_networks: set[tuple[str, str, str]] = set()
+    for first_device in progress(t_devices):
+        for second_device in connections[first_device]:
+            for third_device in connections[second_device]:
+                if third_device == first_device:
+                    continue
 
-            if first_device not in connections[third_device]:
-                continue
+                if first_device not in connections[third_device]:
+                    continue
+
+                network = tuple(sorted([first_device, second_device, third_device]))
+                three_networks.add(network)
 
-            network = tuple(sorted([first_device, second_device, third_device]))
-            three_networks.add(network)
+    return three_networks
 
-print(f"Problem 1: {len(three_networks)}")
+
+def part1(connections: DefaultDict[str, list[str]]) -> int:
+    return len(find_t_three_networks(connections))
 
 
 ################################################################################################
 # Problem 2
-def find_maximum_network():
+def find_maximum_network(connections: DefaultDict[str, list[str]]):
     largest_network = []
 
     nodes: list[str] = list(connections.keys())
@@ -96,4 +106,14 @@ def find_maximum_network():
     return largest_network
 
 
-print(f"Problem 1: {",".join(sorted(find_maximum_network()))}")
+def part2(connections: DefaultDict[str, list[str]]) -> str:
+    return ",".join(sorted(find_maximum_network(connections)))
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    connections = parse(data)
+    print(f"Problem 1: {part1(connections)}")
+    print(f"Problem 2: {part2(connections)}")
@@ -1,8 +1,8 @@
-import aocd
 from typing import DefaultDict
-from tqdm import tqdm as progress
 
 import cli
+import inputs
+from progress import progress
 
 
 sample_data = """\
@@ -53,7 +53,6 @@ y03 OR x01 -> nrd
 hwm AND bqk -> z03
 tgd XOR rvg -> z12
 tnw OR pbm -> gnj"""
-data = sample_data if cli.sample else aocd.data
 
 
 class Gate:
@@ -66,11 +65,11 @@ class Gate:
         self.operation = inputs_str[1].strip()
         self.output = output_str.strip()
 
-    def exec(self, values: dict[str, bool]) -> bool:
+    def exec(self, values: dict[str, bool], gates: dict[str, "Gate"]) -> bool:
         if self.lhs not in values:
-            values[self.lhs] = gates[self.lhs].exec(values)
+            values[self.lhs] = gates[self.lhs].exec(values, gates)
         if self.rhs not in values:
-            values[self.rhs] = gates[self.rhs].exec(values)
+            values[self.rhs] = gates[self.rhs].exec(values, gates)
 
         lhs = values[self.lhs]
         rhs = values[self.rhs]
@@ -86,7 +85,7 @@ class Gate:
         raise "Bruh..."
 
 
-def parse_input(data: str):
+def parse(data: str) -> tuple[dict[str, bool], dict[str, Gate]]:
     [initials_str, gates_str] = data.split("\n\n")
     initials = {}
     for l in initials_str.splitlines():
@@ -97,20 +96,22 @@ def parse_input(data: str):
     return initials, gates
 
 
-initials, gates = parse_input(data)
-
 ################################################################################################
 # Problem 1
-values = initials.copy()
-z_names = list(reversed(sorted(filter(lambda x: x[0] == "z", gates.keys()))))
-for z in z_names:
-    values[z] = gates[z].exec(values)
-z_combo = "".join(map(lambda x: "1" if x else "0", map(values.get, z_names)))
-z_value = int(z_combo, 2)
-print(f"Problem 1: {z_value}")
+def part1(device: tuple[dict[str, bool], dict[str, Gate]]) -> int:
+    (initials, gates) = device
+
+    values = initials.copy()
+    z_names = list(reversed(sorted(filter(lambda x: x[0] == "z", gates.keys()))))
+    for z in z_names:
+        values[z] = gates[z].exec(values, gates)
+    z_combo = "".join(map(lambda x: "1" if x else "0", map(values.get, z_names)))
+    return int(z_combo, 2)
 
 
-def find_output_bit(lhs: str, rhs: str, operation: str) -> str | None:
+def find_output_bit(
+    gates: dict[str, Gate], lhs: str, rhs: str, operation: str
+) -> str | None:
     inputs = tuple(sorted((lhs, rhs, operation)))
     for gate in gates.values():
         gate_inputs = tuple(sorted((gate.lhs, gate.rhs, gate.operation)))
@@ -142,9 +143,12 @@ def find_output_bit(lhs: str, rhs: str, operation: str) -> str | None:
 #   - carry              XOR  interim_sum    ->  out_sum
 #   - interim_sum_carry  OR   interim_carry  ->  out_carry
 def add_bits(
-    lhs: str, rhs: str, carry: str, swapped_outputs: list[str]
+    gates: dict[str, Gate],
+    lhs: str,
+    rhs: str,
+    carry: str,
+    swapped_outputs: list[str],
 ) -> tuple[str | None, str | None]:
-
     # Note: When adding bits to swapped_outputs we don't actually pair them up
     #       as we don't care about the order in the end
     # Note: We assume all over the place that the program in question actually
@@ -152,8 +156,8 @@ def add_bits(
     #       everything here is broken
 
     # find the output bits for these operations
-    interim_sum = find_output_bit(lhs, rhs, "XOR")
-    interim_carry = find_output_bit(lhs, rhs, "AND")
+    interim_sum = find_output_bit(gates, lhs, rhs, "XOR")
+    interim_carry = find_output_bit(gates, lhs, rhs, "AND")
 
     # if either of these is None we are fucked ig, because this program can't add
     # two numbers without changing instructions
@@ -164,8 +168,8 @@ def add_bits(
         # without a carry input we have to do no more work
         out_sum, out_carry = interim_sum, interim_carry
     else:
-        interim_sum_carry = find_output_bit(carry, interim_sum, "AND")
-        out_sum = find_output_bit(carry, interim_sum, "XOR")
+        interim_sum_carry = find_output_bit(gates, carry, interim_sum, "AND")
+        out_sum = find_output_bit(gates, carry, interim_sum, "XOR")
 
         if interim_sum_carry is None:
             # for the program to be well-formed these two have to be None at
@@ -174,8 +178,8 @@ def add_bits(
 
             # can't find output bit, must be swapped
             interim_sum, interim_carry = interim_carry, interim_sum
-            interim_sum_carry = find_output_bit(carry, interim_sum, "AND")
-            out_sum = find_output_bit(carry, interim_sum, "XOR")
+            interim_sum_carry = find_output_bit(gates, carry, interim_sum, "AND")
+            out_sum = find_output_bit(gates, carry, interim_sum, "XOR")
 
             swapped_outputs.append(interim_sum)
             swapped_outputs.append(interim_carry)
@@ -197,7 +201,7 @@ def add_bits(
 
         # we already swapped offending bits in this operation, so this next
         # bit has to be found, otherwise the program must be ill-formed
-        out_carry = find_output_bit(interim_sum_carry, interim_carry, "OR")
+        out_carry = find_output_bit(gates, interim_sum_carry, interim_carry, "OR")
 
     # make sure we are not writing the carry result into a z-bit, we should be
     # writing the sum result into a z-bit
@@ -209,22 +213,32 @@ def add_bits(
     return out_sum, out_carry
 
 
-x_names = list(reversed(sorted(filter(lambda x: x[0] == "x", initials.keys()))))
-y_names = list(reversed(sorted(filter(lambda x: x[0] == "x", initials.keys()))))
-max_bits_xy = int(x_names[0][1:])
-max_bits_z = int(z_names[0][1:])
+def part2(device: tuple[dict[str, bool], dict[str, Gate]]) -> str:
+    (initials, gates) = device
+
+    x_names = list(reversed(sorted(filter(lambda x: x[0] == "x", initials.keys()))))
+    max_bits_xy = int(x_names[0][1:])
+
+    in_carry = None
+    swapped_outputs = []
+    for i in range(max_bits_xy):
+        # get the ith bits
+        lhs = f"x{i:02d}"
+        rhs = f"y{i:02d}"
+
+        # add these two bits and carry bit from last add
+        out_sum, out_carry = add_bits(gates, lhs, rhs, in_carry, swapped_outputs)
+
+        # pass carry to next iteration
+        in_carry = out_carry
 
-in_carry = None
-swapped_outputs = []
-for i in range(max_bits_xy):
-    # get the ith bits
-    lhs = f"x{i:02d}"
-    rhs = f"y{i:02d}"
+    return ",".join(sorted(swapped_outputs))
 
-    # add these two bits and carry bit from last add
-    out_sum, out_carry = add_bits(lhs, rhs, in_carry, swapped_outputs)
 
-    # pass carry to next iteration
-    in_carry = out_carry
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
 
-print(f"Problem 2: {','.join(sorted(swapped_outputs))}")
+    device = parse(data)
+    print(f"Problem 1: {part1(device)}")
+    print(f"Problem 2: {part2(device)}")
@@ -1,10 +1,10 @@
-import aocd
 import itertools
 import functools
 from typing import Iterable
-from tqdm import tqdm as progress
 
 import cli
+import inputs
+from progress import progress
 
 
 sample_data = """\
@@ -47,17 +47,12 @@ sample_data = """\
 #.#..
 #.#.#
 #####"""
-data = sample_data if cli.sample else aocd.data
-
-keys_and_locks = list(map(str.splitlines, data.split("\n\n")))
-height = len(keys_and_locks[0])
-width = len(keys_and_locks[0][0])
-
-keys = list(filter(lambda s: all(t == "." for t in s[0]), keys_and_locks))
-locks = list(filter(lambda s: all(t == "#" for t in s[0]), keys_and_locks))
 
 
 def to_height_field(key_or_lock: list[str], key: bool):
+    height = len(key_or_lock)
+    width = len(key_or_lock[0])
+
     search = "#" if key else "."
     height_field = []
     for x in range(width):
@@ -68,8 +63,19 @@ def to_height_field(key_or_lock: list[str], key: bool):
     return height_field
 
 
-keys = list(map(functools.partial(to_height_field, key=True), keys))
-locks = list(map(functools.partial(to_height_field, key=False), locks))
+KeysAndLocks = tuple[list[list[int]], list[list[int]], int]
+
+
+def parse(data: str) -> KeysAndLocks:
+    keys_and_locks = list(map(str.splitlines, data.split("\n\n")))
+    height = len(keys_and_locks[0])
+
+    keys = list(filter(lambda s: all(t == "." for t in s[0]), keys_and_locks))
+    locks = list(filter(lambda s: all(t == "#" for t in s[0]), keys_and_locks))
+
+    keys = list(map(functools.partial(to_height_field, key=True), keys))
+    locks = list(map(functools.partial(to_height_field, key=False), locks))
+    return keys, locks, height
 
 
 ################################################################################################
@@ -78,14 +84,29 @@ def vec_add(lhs: Iterable, rhs: Iterable) -> Iterable:
     return itertools.starmap(lambda x, y: x + y, zip(lhs, rhs))
 
 
-matching_pairs = list(
-    filter(
-        lambda l: all(x < height - 1 for x in l),
-        itertools.starmap(vec_add, itertools.product(keys, locks)),
+def part1(keys_and_locks: KeysAndLocks) -> int:
+    (keys, locks, height) = keys_and_locks
+
+    matching_pairs = list(
+        filter(
+            lambda l: all(x < height - 1 for x in l),
+            itertools.starmap(vec_add, itertools.product(keys, locks)),
+        )
     )
-)
-print(f"Problem 1: {len(matching_pairs)}")
+    return len(matching_pairs)
+
 
 ################################################################################################
 # Problem 2
-print("Problem 2: I'm freeee")
+def part2(keys_and_locks: KeysAndLocks) -> str:
+    # there is no second problem on the last day
+    return "I'm freeee"
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    keys_and_locks = parse(data)
+    print(f"Problem 1: {part1(keys_and_locks)}")
+    print(f"Problem 2: {part2(keys_and_locks)}")
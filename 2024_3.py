@@ -1,34 +1,72 @@
-import aocd
 import re
-from functools import reduce
-from operator import mul
+import mmap
+from typing import NamedTuple
 
 import cli
+import inputs
 
 sample_data = (
     "xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
 )
-data = sample_data if cli.sample else aocd.data
 
 dont_do_re = re.compile(r"(don't\(\)).*?(do\(\))")
 mul_re = re.compile(r"mul\((\d+),(\d+)\)")
 
-instructions = [map(int, inst) for inst in re.findall(mul_re, data)]
-multiplications = [reduce(mul, instruction) for instruction in instructions]
-print(f"Problem 1: {sum(multiplications)}")
 
-data = re.sub(dont_do_re, "", "".join(data.splitlines()))
-data = data.split("don't")[0]
-instructions = [map(int, inst) for inst in re.findall(mul_re, data)]
-multiplications = [reduce(mul, instruction) for instruction in instructions]
-print(f"Problem 2: {sum(multiplications)}")
+# all three instructions in one pattern, so a single scan sees them in order
+instruction_re = re.compile(rb"mul\((\d+),(\d+)\)|do\(\)|don't\(\)")
 
-if cli.visualize:
+
+class Sums(NamedTuple):
+    all: int
+    enabled: int
+
+
+def scan(memory: mmap.mmap | bytes) -> Sums:
+    """
+    Adds up the multiplications in one pass, both all of them and only those enabled at the
+    time. Works on an mmap as is, the memory is never copied or decoded.
+    """
+    all_sum = 0
+    enabled_sum = 0
+    enabled = True
+    for match in instruction_re.finditer(memory):
+        lhs = match[1]
+        if lhs is None:
+            # do() is four bytes, don't() seven
+            enabled = len(match[0]) == 4
+            continue
+
+        product = int(lhs) * int(match[2])
+        all_sum += product
+        if enabled:
+            enabled_sum += product
+    return Sums(all_sum, enabled_sum)
+
+
+def parse(data: str) -> Sums:
+    return scan(data.encode())
+
+
+################################################################################################
+# Problem 1
+def part1(sums: Sums) -> int:
+    return sums.all
+
+
+################################################################################################
+# Problem 2
+def part2(sums: Sums) -> int:
+    return sums.enabled
+
+
+def visualize(data: str):
     import manim
     import math
     import pathlib
+    from functools import reduce
+    from operator import mul
 
-    data = sample_data if cli.sample else aocd.data
     data = "".join(data.splitlines())
     data = data.replace("{", "<").replace("}", ">").replace(" ", "_")
     if not cli.sample:
@@ -191,3 +229,16 @@ if cli.visualize:
     if cli.sample:
         manim.config.output_file = f"{manim.config.output_file}_sample"
     InstructionsScene().render()
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    if cli.sample:
+        sums = parse(sample_data)
+    else:
+        sums = scan(inputs.get_bytes(cli.day))
+    print(f"Problem 1: {part1(sums)}")
+    print(f"Problem 2: {part2(sums)}")
+
+    if cli.visualize:
+        visualize(sample_data if cli.sample else inputs.get_data(cli.day))
@@ -1,8 +1,6 @@
-import aocd
-from functools import reduce
-from operator import mul
-
 import cli
+import inputs
+from grid import Grid
 
 sample_data = """\
 MMMSXXMASM
@@ -15,11 +13,7 @@ SMSMSASXSS
 SAXAMASAAA
 MAMMMXMMMM
 MXMXAXMASX"""
-data = sample_data if cli.sample else aocd.data
-
 
-word_puzzle = data.splitlines()
-width, height = len(word_puzzle[0]), len(word_puzzle)
 
 directions = [
     (-1, 0),
@@ -31,31 +25,98 @@ directions = [
     (1, 1),
     (-1, 1),
 ]
-num_xmas = 0
-for x in range(width):
-    for y in range(height):
-        if word_puzzle[y][x] != "X":
-            continue
-        for dir in directions:
-            w = "X"
-            for i in range(1, 4):
-                x2 = x + dir[0] * i
-                y2 = y + dir[1] * i
-                if x2 < 0 or y2 < 0 or x2 >= width or y2 >= height:
-                    break
-                w += word_puzzle[y2][x2]
-            if w == "XMAS":
-                num_xmas += 1
-print(f"Problem 1: {num_xmas}")
-
-valid_mas = ("MAS", "SAM")
-num_cross_mas = 0
-for x in range(1, width - 1):
-    for y in range(1, height - 1):
-        if word_puzzle[y][x] != "A":
-            continue
-        mas_1 = word_puzzle[y - 1][x - 1] + "A" + word_puzzle[y + 1][x + 1]
-        mas_2 = word_puzzle[y - 1][x + 1] + "A" + word_puzzle[y + 1][x - 1]
-        if mas_1 in valid_mas and mas_2 in valid_mas:
-            num_cross_mas += 1
-print(f"Problem 2: {num_cross_mas}")
+
+# offset from the anchor cell -> letter expected there
+Stencil = dict[tuple[int, int], str]
+
+
+def parse(data: str) -> Grid:
+    return Grid.parse(data)
+
+
+def word_stencils(word: str) -> list[Stencil]:
+    """The word read from its first letter in each of the eight directions"""
+    return [
+        {(dx * i, dy * i): letter for i, letter in enumerate(word)}
+        for (dx, dy) in directions
+    ]
+
+
+def picture_stencil(picture: str) -> Stencil:
+    """A stencil drawn as text with '.' for don't care, anchored at its top-left corner"""
+    return {
+        (x, y): letter
+        for y, row in enumerate(picture.splitlines())
+        for x, letter in enumerate(row)
+        if letter != "."
+    }
+
+
+def rotations(stencil: Stencil) -> list[Stencil]:
+    """The stencil in all four 90° rotations, symmetric ones only once"""
+    rotated = []
+    for _ in range(4):
+        if stencil not in rotated:
+            rotated.append(stencil)
+        stencil = {(-y, x): letter for (x, y), letter in stencil.items()}
+    return rotated
+
+
+def count_matches(word_puzzle: Grid, stencils: list[Stencil]) -> int:
+    """
+    Counts the anchor cells at which each stencil matches, summed over all stencils. Every
+    letter gets one boolean plane, a stencil is the AND of its letters' planes, each shifted
+    by the letter's offset, so every stencil is checked on all cells at once.
+    """
+    import numpy as np
+
+    cells = word_puzzle.as_array()
+    padding = word_puzzle.padding
+    # the zero border never matches a letter, so shifted planes can't wrap around
+    reach = max(max(abs(dx), abs(dy)) for s in stencils for (dx, dy) in s)
+    if reach > padding:
+        cells = np.pad(cells, reach - padding)
+        padding = reach
+
+    (width, height) = (word_puzzle.width, word_puzzle.height)
+    planes = {}
+    matches = 0
+    for stencil in stencils:
+        matched = np.ones((height, width), dtype=bool)
+        for (dx, dy), letter in stencil.items():
+            if letter not in planes:
+                planes[letter] = cells == ord(letter)
+            top = padding + dy
+            left = padding + dx
+            matched &= planes[letter][top : top + height, left : left + width]
+        matches += int(np.count_nonzero(matched))
+    return matches
+
+
+################################################################################################
+# Problem 1
+def part1(word_puzzle: Grid) -> int:
+    return count_matches(word_puzzle, word_stencils("XMAS"))
+
+
+################################################################################################
+# Problem 2
+cross_mas = picture_stencil(
+    """\
+M.S
+.A.
+M.S"""
+)
+
+
+def part2(word_puzzle: Grid) -> int:
+    return count_matches(word_puzzle, rotations(cross_mas))
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    word_puzzle = parse(data)
+    print(f"Problem 1: {part1(word_puzzle)}")
+    print(f"Problem 2: {part2(word_puzzle)}")
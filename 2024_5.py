@@ -1,9 +1,7 @@
-import aocd
 import collections
-import itertools
-import functools
 
 import cli
+import inputs
 
 sample_data = """\
 47|53
@@ -34,43 +32,102 @@ sample_data = """\
 75,97,47,61,53
 61,13,29
 97,13,75,29,47"""
-data = sample_data if cli.sample else aocd.data
 
-order_rules = [list(map(int, l.split("|"))) for l in data.split("\n\n")[0].splitlines()]
-productions = [list(map(int, l.split(","))) for l in data.split("\n\n")[1].splitlines()]
 
+# page -> pages that have to come after it
+OrderRules = dict[int, set[int]]
+Productions = list[list[int]]
 
-def sliding_window(iterable, n):
-    iterator = iter(iterable)
-    window = collections.deque(itertools.islice(iterator, n - 1), maxlen=n)
-    for x in iterator:
-        window.append(x)
-        yield tuple(window)
 
+def parse(data: str) -> tuple[OrderRules, Productions]:
+    [order_rules, productions] = data.split("\n\n")
 
-def is_right_order(production):
-    for [lhs, rhs] in sliding_window(production, 2):
-        rhs_rules = [right for [left, right] in order_rules if left == rhs]
-        if lhs in rhs_rules:
-            return False
+    # compiled once, all checks and fixes look rules up by page
+    rules_index: OrderRules = collections.defaultdict(set)
+    for l in order_rules.splitlines():
+        [left, right] = map(int, l.split("|"))
+        rules_index[left].add(right)
+
+    productions = [list(map(int, l.split(","))) for l in productions.splitlines()]
+    return dict(rules_index), productions
+
+
+################################################################################################
+# Problem 1
+def is_right_order(order_rules: OrderRules, production: list[int]) -> bool:
+    position = {page: i for i, page in enumerate(production)}
+    for i, page in enumerate(production):
+        for later_page in order_rules.get(page, ()):
+            if position.get(later_page, i) < i:
+                return False
     return True
 
 
-right_order_productions = [prod for prod in productions if is_right_order(prod)]
-right_order_middle_pages = [prod[len(prod) // 2] for prod in right_order_productions]
-print(f"Problem 1: {sum(right_order_middle_pages)}")
+def split_by_order(
+    order_rules: OrderRules, productions: Productions
+) -> tuple[Productions, Productions]:
+    right_order: Productions = []
+    wrong_order: Productions = []
+    for production in productions:
+        if is_right_order(order_rules, production):
+            right_order.append(production)
+        else:
+            wrong_order.append(production)
+    return right_order, wrong_order
+
+
+def part1(manual: tuple[OrderRules, Productions]) -> int:
+    order_rules, productions = manual
+
+    right_order_productions, _ = split_by_order(order_rules, productions)
+    right_order_middle_pages = [
+        prod[len(prod) // 2] for prod in right_order_productions
+    ]
+    return sum(right_order_middle_pages)
+
+
+################################################################################################
+# Problem 2
+def fix_order(order_rules: OrderRules, production: list[int]) -> list[int]:
+    # Kahn's algorithm, only on the rules between pages of this production since the rules
+    # as a whole may well have cycles
+    pages = set(production)
+    later_pages = {page: order_rules.get(page, set()) & pages for page in production}
+    num_earlier_pages = dict.fromkeys(production, 0)
+    for page in production:
+        for later_page in later_pages[page]:
+            num_earlier_pages[later_page] += 1
+
+    ready = collections.deque(p for p in production if num_earlier_pages[p] == 0)
+    fixed_production = []
+    while ready:
+        page = ready.popleft()
+        fixed_production.append(page)
+        for later_page in later_pages[page]:
+            num_earlier_pages[later_page] -= 1
+            if num_earlier_pages[later_page] == 0:
+                ready.append(later_page)
+
+    if len(fixed_production) != len(production):
+        raise ValueError(f"Order rules are cyclic for {production}")
+    return fixed_production
+
 
+def part2(manual: tuple[OrderRules, Productions]) -> int:
+    order_rules, productions = manual
 
-def fix_order(production):
-    def compare(lhs, rhs):
-        rhs_rules = [right for [left, right] in order_rules if left == rhs]
-        return -1 if lhs in rhs_rules else 1
+    _, wrong_order_productions = split_by_order(order_rules, productions)
+    fixed_productions = [
+        fix_order(order_rules, prod) for prod in wrong_order_productions
+    ]
+    fixed_middle_pages = [prod[len(prod) // 2] for prod in fixed_productions]
+    return sum(fixed_middle_pages)
 
-    return sorted(production, key=functools.cmp_to_key(compare))
 
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
 
-fixed_productions = [
-    fix_order(prod) for prod in productions if not is_right_order(prod)
-]
-fixed_middle_pages = [prod[len(prod) // 2] for prod in fixed_productions]
-print(f"Problem 2: {sum(fixed_middle_pages)}")
+    manual = parse(data)
+    print(f"Problem 1: {part1(manual)}")
+    print(f"Problem 2: {part2(manual)}")
@@ -1,6 +1,10 @@
-import aocd
+import os
+from array import array
 
 import cli
+import inputs
+import metrics
+from grid import Grid
 
 sample_data = """\
 ....#.....
@@ -13,87 +17,274 @@ sample_data = """\
 ........#.
 #.........
 ......#..."""
-data = sample_data if cli.sample else aocd.data
-
-floor = data.splitlines()
-width = len(floor[0])
-height = len(floor)
-
-pos_in_range_map = {
-    (-1, 0): lambda x: x[0] >= 0,
-    (+1, 0): lambda x: x[0] < width,
-    (0, -1): lambda x: x[1] >= 0,
-    (0, +1): lambda x: x[1] < height,
-}
-
-start_pos = data.replace("\n", "").find("^")
-start_pos = (start_pos % width, start_pos // width)
-
-path = []
-pos = start_pos
-dir = (0, -1)
-while pos_in_range_map[dir](pos):
-    path += [(pos, dir)]
-
-    pos = (pos[0] + dir[0], pos[1] + dir[1])
-    (x, y) = pos
-    if not pos_in_range_map[dir](pos):
-        break
-    elif floor[y][x] == "#":
-        pos = (pos[0] - dir[0], pos[1] - dir[1])
-        dir = (-dir[1], dir[0])
-
-visited = set(map(lambda x: tuple(x[0]), path))
-print(f"Problem 1: {len(visited)}")
-
-
-def next_obstructed_path():
-    for i, ((ox, oy), odir) in enumerate(path):
-
-        def loop_path():
-            pos = (ox, oy)
-            dir = odir
-            loop_visited = [[None] * width for _ in range(height)]
-            loop_path = []
-            while pos_in_range_map[dir](pos):
-                loop_path += [(pos, dir)]
-
-                (x, y) = pos
-                if vis := loop_visited[y][x]:
-                    if dir in vis:
-                        return loop_path
-                    vis.append(dir)
-                else:
-                    loop_visited[y][x] = [dir]
-
-                pos = (pos[0] + dir[0], pos[1] + dir[1])
-                (x, y) = pos
-                if not pos_in_range_map[dir](pos):
-                    break
-                elif floor[y][x] == "#" or (x, y) == (ox + odir[0], oy + odir[1]):
-                    pos = (pos[0] - dir[0], pos[1] - dir[1])
-                    dir = (-dir[1], dir[0])
-            return None
-
-        if p := loop_path():
-            yield ((ox, oy), p)
-
-
-if not cli.visualize:
-    obstructed_paths = list(next_obstructed_path())
-    print(f"Problem 2: {len(obstructed_paths)}")
-
-
-if cli.visualize:
+
+
+def parse(data: str) -> Grid:
+    return Grid.parse(data)
+
+
+# in the order of Grid.offsets_4, so turning right is going to the next heading
+headings = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+up = 3
+
+# states are cell * 4 + heading
+Walk = list[tuple[int, int]]
+
+
+################################################################################################
+# Problem 1
+def walk_cells(floor: Grid) -> Walk:
+    offsets = floor.offsets_4
+    path = []
+    cell = floor.find(b"^")
+    heading = up
+    while True:
+        path.append((cell, heading))
+
+        tile = floor[cell + offsets[heading]]
+        if tile == floor.border:
+            break
+        elif tile == ord("#"):
+            heading = (heading + 1) % 4
+        else:
+            cell += offsets[heading]
+
+    return path
+
+
+def walk_floor(floor: Grid):
+    return [
+        (floor.coords(cell), headings[heading]) for cell, heading in walk_cells(floor)
+    ]
+
+
+def part1(floor: Grid) -> int:
+    path = walk_cells(floor)
+    visited = set(cell for cell, _ in path)
+    return len(visited)
+
+
+################################################################################################
+# Problem 2
+def find_candidates(floor: Grid, path: Walk) -> list[tuple[int, int, int]]:
+    """
+    Each cell the guard walks into, except the start, once as (cell, heading, obstacle) with
+    the state right before the guard first steps onto it. An obstacle there changes nothing
+    before that point, so its check can start from this state instead of from the start.
+    """
+    offsets = floor.offsets_4
+    seen = {path[0][0]}
+    candidates = []
+    for cell, heading in path:
+        ahead = cell + offsets[heading]
+        tile = floor[ahead]
+        if tile != floor.border and tile != ord("#") and ahead not in seen:
+            seen.add(ahead)
+            candidates.append((cell, heading, ahead))
+    return candidates
+
+
+def next_obstructed_path(floor: Grid, path):
+    """Walks each obstructed path step by step, only needed to visualize them"""
+    walk = [(floor.index(*pos), headings.index(dir)) for pos, dir in path]
+    for cell, heading, obstacle in find_candidates(floor, walk):
+        (ox, oy) = floor.coords(cell)
+        loop_visited = set()
+        loop_path = []
+        while (cell, heading) not in loop_visited:
+            loop_visited.add((cell, heading))
+            loop_path.append((floor.coords(cell), headings[heading]))
+
+            next_cell = cell + floor.offsets_4[heading]
+            if floor[next_cell] == floor.border:
+                break
+            elif floor[next_cell] == ord("#") or next_cell == obstacle:
+                heading = (heading + 1) % 4
+            else:
+                cell = next_cell
+        else:
+            yield ((ox, oy), loop_path)
+
+
+def find_stops(floor: Grid) -> list[array]:
+    tiles = floor.cells
+    obstacle = ord("#")
+    all_stops = []
+    for offset in floor.offsets_4:
+        stops = array("l", [-1]) * len(tiles)
+        # fill from the far end, so the stop of the cell ahead is already known
+        cells = list(floor.indices())
+        if offset > 0:
+            cells.reverse()
+        for cell in cells:
+            ahead = tiles[cell + offset]
+            if ahead == obstacle:
+                stops[cell] = cell
+            elif ahead != floor.border:
+                stops[cell] = stops[cell + offset]
+        all_stops.append(stops)
+    return all_stops
+
+
+class JumpTable:
+    """
+    For every cell and heading the cell where the guard stops in front of the next obstacle,
+    or -1 if it walks off the floor instead. With that the guard moves from turn to turn in
+    a single lookup. An added obstacle is only on the way if it is in the same row or column,
+    the table is patched for it on the fly instead of being rebuilt.
+    """
+
+    def __init__(self, floor: Grid, stops: list | None = None):
+        self.floor = floor
+        self.stride = floor.stride
+        self.offsets = floor.offsets_4
+        # the stops are only passed in by workers, which view them in shared memory
+        self.stops = find_stops(floor) if stops is None else stops
+
+        # visited turns, stamped with the epoch of the check, so they never need clearing
+        self.visited = array("l", [0]) * (len(floor.cells) * 4)
+        self.epoch = 0
+
+    def loops(self, cell: int, heading: int, obstacle: int) -> bool:
+        """Whether the guard, at `cell` facing `heading`, loops with an obstacle added"""
+        if self.floor[obstacle] == self.floor.border:
+            return False
+
+        self.epoch += 1
+        epoch = self.epoch
+        visited = self.visited
+        stride = self.stride
+        (obstacle_row, obstacle_column) = divmod(obstacle, stride)
+
+        jumps = 0
+        while True:
+            jumps += 1
+            stop = self.stops[heading][cell]
+
+            offset = self.offsets[heading]
+            (row, column) = divmod(cell, stride)
+            if heading % 2 == 0:
+                on_the_way = row == obstacle_row
+            else:
+                on_the_way = column == obstacle_column
+            if on_the_way:
+                distance = (obstacle - cell) // offset
+                if distance > 0 and (stop < 0 or distance <= (stop - cell) // offset):
+                    stop = obstacle - offset
+
+            if stop < 0:
+                looped = False
+                break
+
+            state = stop * 4 + heading
+            if visited[state] == epoch:
+                looped = True
+                break
+            visited[state] = epoch
+
+            cell = stop
+            heading = (heading + 1) % 4
+
+        if metrics.enabled:
+            metrics.observe("day6.jumps_per_candidate", jumps)
+        return looped
+
+
+# candidates below which starting worker processes costs more than it saves
+parallel_threshold = 2000
+
+# the jump table of a worker process and the shared memory block it views
+worker_table: JumpTable | None = None
+worker_block = None
+
+
+def share_jump_table(jump_table: JumpTable):
+    """Copies the stops and then the floor into one shared memory block, stops stay aligned"""
+    from multiprocessing.shared_memory import SharedMemory
+
+    cells = jump_table.floor.cells
+    stops_size = len(cells) * jump_table.stops[0].itemsize
+    block = SharedMemory(create=True, size=4 * stops_size + len(cells))
+    for heading, stops in enumerate(jump_table.stops):
+        start = heading * stops_size
+        block.buf[start : start + stops_size] = memoryview(stops).cast("B")
+    block.buf[4 * stops_size : 4 * stops_size + len(cells)] = cells
+    return block
+
+
+def attach_jump_table(name: str, width: int, height: int) -> None:
+    from multiprocessing.shared_memory import SharedMemory
+
+    global worker_table, worker_block
+    worker_block = SharedMemory(name=name)
+    floor_size = (width + 2) * (height + 2)
+    stops_size = floor_size * array("l").itemsize
+
+    buffer = worker_block.buf
+    stops = [
+        buffer[heading * stops_size : (heading + 1) * stops_size].cast("l")
+        for heading in range(4)
+    ]
+    cells = buffer[4 * stops_size : 4 * stops_size + floor_size]
+    worker_table = JumpTable(Grid(width, height, cells), stops)
+
+
+def count_loops(candidates: list[tuple[int, int, int]]) -> int:
+    return sum(worker_table.loops(*candidate) for candidate in candidates)
+
+
+def count_loops_parallel(
+    jump_table: JumpTable, candidates: list[tuple[int, int, int]], processes: int
+) -> int:
+    """
+    Shards the candidates over a process pool. The floor and the jump table go into shared
+    memory once, so the workers only receive the candidates and send back their loop counts.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    floor = jump_table.floor
+    block = share_jump_table(jump_table)
+    try:
+        # a few shards per process, so a slow shard does not leave the others idle
+        shard_size = -(-len(candidates) // (processes * 4))
+        shards = [
+            candidates[i : i + shard_size]
+            for i in range(0, len(candidates), shard_size)
+        ]
+        with ProcessPoolExecutor(
+            processes,
+            initializer=attach_jump_table,
+            initargs=(block.name, floor.width, floor.height),
+        ) as pool:
+            return sum(pool.map(count_loops, shards))
+    finally:
+        block.close()
+        block.unlink()
+
+
+def part2(floor: Grid, processes: int | None = None) -> int:
+    candidates = find_candidates(floor, walk_cells(floor))
+    jump_table = JumpTable(floor)
+    if metrics.enabled:
+        metrics.count("day6.candidates", len(candidates))
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    # metrics and profilers only see this process, so with either the work has to stay in it
+    in_process = metrics.enabled or cli.profile is not None
+    if processes > 1 and len(candidates) >= parallel_threshold and not in_process:
+        return count_loops_parallel(jump_table, candidates, processes)
+    return sum(jump_table.loops(*candidate) for candidate in candidates)
+
+
+def visualize(floor: Grid, path):
     import manim
     import pathlib
-    import itertools
 
-    obstacle_positions = [
-        (x, y)
-        for (x, y) in itertools.product(range(0, width), range(0, height))
-        if floor[y][x] == "#"
-    ]
+    width = floor.width
+    height = floor.height
+
+    obstacle_positions = [tuple(floor.coords(i)) for i in floor.find_all(b"#")]
 
     def to_manim(point):
         return (point[0], point[1], 0)
@@ -123,7 +314,7 @@ if cli.visualize:
         return path_points
 
     reduced_path = reduce_path(path, extend=True)
-    obstructed_path_gen = next_obstructed_path()
+    obstructed_path_gen = next_obstructed_path(floor, path)
 
     class ObstructedPath:
         def __init__(self):
@@ -261,3 +452,16 @@ if cli.visualize:
     if cli.sample:
         manim.config.output_file = f"{manim.config.output_file}_sample"
     FloorScene().render()
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    floor = parse(data)
+    print(f"Problem 1: {part1(floor)}")
+
+    if not cli.visualize:
+        print(f"Problem 2: {part2(floor)}")
+    else:
+        visualize(floor, walk_floor(floor))
@@ -1,6 +1,12 @@
-import aocd
+import os
+from array import array
+from bisect import bisect_right
+from functools import partial
+from operator import add, mul
+from typing import Callable, NamedTuple, Sequence
 
 import cli
+import inputs
 
 sample_data = """\
 190: 10 19
@@ -12,67 +18,219 @@ sample_data = """\
 192: 17 8 14
 21037: 9 7 18 13
 292: 11 6 16 20"""
-data = sample_data if cli.sample else aocd.data
-
-
-class Calibration:
-    def __init__(self, data):
-        [result, values] = data.split(":")
-        self.result = int(result)
-        self.values = list(map(int, values.split()))
-        self.operators = ["+", "*"]
-
-    def solve(self):
-        num_values = len(self.values)
-
-        def solve_impl(result, values_handled, partial_attempt):
-            if values_handled == num_values:
-                if result == partial_attempt:
-                    return True
-                return False
-            elif partial_attempt >= result:
-                return None
-
-            for operator in self.operators:
-                match operator:
-                    case "+":
-                        next_attempt = partial_attempt + self.values[values_handled]
-                    case "*":
-                        next_attempt = partial_attempt * self.values[values_handled]
-                    case "|":
-                        next_attempt = int(
-                            str(partial_attempt) + str(self.values[values_handled])
-                        )
-                next_values_handled = values_handled + 1
-                if solution := solve_impl(result, next_values_handled, next_attempt):
-                    return solution
-
-            return False
-
-        return solve_impl(self.result, 0, 0)
-
-
-class ExtendedCalibration(Calibration):
-    def __init__(self, data):
-        super().__init__(data)
-        self.operators += ["|"]
-
-
-calibrations = list(map(Calibration, data.splitlines()))
-solvable_calibrations = list(map(Calibration.solve, calibrations))
-solvable_calibrations_results = [
-    c.result for c, s in zip(calibrations, solvable_calibrations) if s
-]
-
-print(f"Problem 1: {sum(solvable_calibrations_results)}")
-
-
-extended_calibrations = list(map(ExtendedCalibration, data.splitlines()))
-solvable_extended_calibrations = list(
-    map(ExtendedCalibration.solve, extended_calibrations)
-)
-solvable_extended_calibrations_results = [
-    c.result for c, s in zip(extended_calibrations, solvable_extended_calibrations) if s
-]
-
-print(f"Problem 2: {sum(solvable_extended_calibrations_results)}")
+
+
+class Operator(NamedTuple):
+    symbol: str
+    # lhs, rhs -> lhs op rhs
+    forward: Callable[[int, int], int]
+    # result, rhs -> the lhs for which lhs op rhs == result, or None if there is none
+    inverse: Callable[[int, int], int | None]
+
+
+operators: dict[str, Operator] = {}
+
+
+def register_operator(
+    symbol: str,
+    forward: Callable[[int, int], int],
+    inverse: Callable[[int, int], int | None],
+) -> Operator:
+    operators[symbol] = Operator(symbol, forward, inverse)
+    return operators[symbol]
+
+
+# all values are positive, so an inverse never has to consider an lhs of 0 or below
+def unadd(result: int, rhs: int) -> int | None:
+    return result - rhs if result > rhs else None
+
+
+def unmul(result: int, rhs: int) -> int | None:
+    return result // rhs if result % rhs == 0 else None
+
+
+powers_of_ten = [10**digits for digits in range(40)]
+
+
+def concatenate(lhs: int, rhs: int) -> int:
+    return lhs * powers_of_ten[bisect_right(powers_of_ten, rhs)] + rhs
+
+
+def unconcatenate(result: int, rhs: int) -> int | None:
+    # the lhs is what is left after cutting the digits of rhs off the end
+    (lhs, suffix) = divmod(result, powers_of_ten[bisect_right(powers_of_ten, rhs)])
+    return lhs if suffix == rhs and lhs > 0 else None
+
+
+register_operator("+", add, unadd)
+register_operator("*", mul, unmul)
+register_operator("|", concatenate, unconcatenate)
+
+
+def find_operators(
+    result: int, values: Sequence[int], operators: list[Operator]
+) -> list[Operator] | None:
+    """
+    Works backwards from the result, undoing the last operator at each step. Most operators
+    can only be undone for few results, e.g. * only if the result is divisible by the last
+    value, so most branches end on their first step instead of after all values.
+    """
+    inverses = [operator.inverse for operator in operators]
+    first = values[0]
+
+    def find_impl(result: int, values_left: int) -> list[int] | None:
+        if values_left == 1:
+            return [] if result == first else None
+
+        value = values[values_left - 1]
+        for index, inverse in enumerate(inverses):
+            lhs = inverse(result, value)
+            if lhs is not None:
+                found = find_impl(lhs, values_left - 1)
+                if found is not None:
+                    found.append(index)
+                    return found
+        return None
+
+    found = find_impl(result, len(values))
+    if found is None:
+        return None
+    return [operators[index] for index in found]
+
+
+def evaluate(values: Sequence[int], operators: list[Operator]) -> int:
+    result = values[0]
+    for operator, value in zip(operators, values[1:]):
+        result = operator.forward(result, value)
+    return result
+
+
+basic_operators = [operators["+"], operators["*"]]
+extended_operators = basic_operators + [operators["|"]]
+
+
+class Equations:
+    """
+    All equations back to back in flat arrays, the values of equation i are
+    `values[starts[i]:starts[i + 1]]`. Results can outgrow 64 bits, so those stay in a list.
+    """
+
+    def __init__(self, results: list[int], values: array, starts: array):
+        self.results = results
+        self.values = values
+        self.starts = starts
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __getitem__(self, index: int) -> tuple[int, array]:
+        return (
+            self.results[index],
+            self.values[self.starts[index] : self.starts[index + 1]],
+        )
+
+    def slice(self, start: int, stop: int) -> "Equations":
+        first = self.starts[start]
+        return Equations(
+            self.results[start:stop],
+            self.values[first : self.starts[stop]],
+            array(
+                "l",
+                (value_start - first for value_start in self.starts[start : stop + 1]),
+            ),
+        )
+
+
+def describe(result: int, values: array, operators: list[Operator]) -> str:
+    found = find_operators(result, values, operators)
+    if found is None:
+        return f"{result} != {' ? '.join(map(str, values))}"
+    assert evaluate(values, found) == result
+    expression = [str(values[0])]
+    for operator, value in zip(found, values[1:]):
+        expression += [operator.symbol, str(value)]
+    return f"{result} = {' '.join(expression)}"
+
+
+def parse(data: str) -> Equations:
+    results = []
+    values = array("l")
+    starts = array("l", [0])
+    for line in data.splitlines():
+        (result, _, line_values) = line.partition(":")
+        results.append(int(result))
+        values.extend(map(int, line_values.split()))
+        starts.append(len(values))
+    return Equations(results, values, starts)
+
+
+def calibrate(equations: Equations, extended: bool) -> int:
+    """
+    Sum of the results of all solvable equations. With extended operators the basic ones are
+    still tried first, their search is much smaller and already solves many equations.
+    """
+    total = 0
+    for index in range(len(equations)):
+        (result, values) = equations[index]
+        if find_operators(result, values, basic_operators) is not None:
+            total += result
+        elif (
+            extended and find_operators(result, values, extended_operators) is not None
+        ):
+            total += result
+    return total
+
+
+# equations below which starting worker processes costs more than it saves
+parallel_threshold = 20000
+
+
+def calibrate_parallel(equations: Equations, extended: bool, processes: int) -> int:
+    from concurrent.futures import ProcessPoolExecutor
+
+    # more chunks than processes, the search time per equation varies a lot
+    chunk_size = -(-len(equations) // (processes * 4))
+    chunks = [
+        equations.slice(start, min(start + chunk_size, len(equations)))
+        for start in range(0, len(equations), chunk_size)
+    ]
+    with ProcessPoolExecutor(processes) as pool:
+        return sum(pool.map(partial(calibrate, extended=extended), chunks))
+
+
+def calibration_total(
+    equations: Equations, extended: bool, processes: int | None = None
+) -> int:
+    if processes is None:
+        processes = os.cpu_count() or 1
+    # a profiler only sees this process, so the work has to stay in it
+    if processes > 1 and len(equations) >= parallel_threshold and cli.profile is None:
+        return calibrate_parallel(equations, extended, processes)
+    return calibrate(equations, extended)
+
+
+################################################################################################
+# Problem 1
+def part1(equations: Equations) -> int:
+    if cli.verbose:
+        for index in range(len(equations)):
+            print(describe(*equations[index], basic_operators))
+    return calibration_total(equations, extended=False)
+
+
+################################################################################################
+# Problem 2
+def part2(equations: Equations) -> int:
+    if cli.verbose:
+        for index in range(len(equations)):
+            print(describe(*equations[index], extended_operators))
+    return calibration_total(equations, extended=True)
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    equations = parse(data)
+    print(f"Problem 1: {part1(equations)}")
+    print(f"Problem 2: {part2(equations)}")
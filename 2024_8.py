@@ -1,8 +1,12 @@
-import aocd
-import re
 import itertools
+import math
+import re
+from typing import NamedTuple
 
 import cli
+import inputs
+from grid import Grid
+from vector import Vector
 
 sample_data = """\
 ............
@@ -17,93 +21,121 @@ sample_data = """\
 .........A..
 ............
 ............"""
-data = sample_data if cli.sample else aocd.data
-flat_data = "".join(data.splitlines())
-
-city = data.splitlines()
-width = len(city[0])
-height = len(city)
-flat_idx_to_coords = lambda i: (i % width, i // width)
-is_in_range = lambda p: p[0] >= 0 and p[1] >= 0 and p[0] < width and p[1] < height
-
-antenna_types = set(re.findall(r"[^\.]", flat_data))
-antenna_positions = {
-    antenna_type: list(
-        map(
-            lambda x: flat_idx_to_coords(x.regs[0][0]),
-            re.finditer(antenna_type, flat_data),
-        )
-    )
-    for antenna_type in antenna_types
-}
-
-anti_nodes = [[set() for _ in range(width)] for _ in range(height)]
-
-for antenna_type, positions in antenna_positions.items():
-    pairwise_positions = itertools.product(positions, positions)
-    for l, r in pairwise_positions:
-        if l == r:
-            continue
-
-        d = (l[0] - r[0], l[1] - r[1])
-        anti_node_l = (l[0] + d[0], l[1] + d[1])
-        if is_in_range(anti_node_l):
-            anti_nodes[anti_node_l[1]][anti_node_l[0]].add(antenna_type)
-        anti_node_r = (r[0] - d[0], r[1] - d[1])
-        if is_in_range(anti_node_r):
-            anti_nodes[anti_node_r[1]][anti_node_r[0]].add(antenna_type)
-
-anti_nodes_flat = list(itertools.chain.from_iterable(anti_nodes))
-num_positions_with_anti_nodes = len(anti_nodes_flat) - anti_nodes_flat.count(set())
-print(f"Problem 1: {num_positions_with_anti_nodes}")
-
-
-real_anti_nodes = [[set() for _ in range(width)] for _ in range(height)]
-
-
-def get_anti_nodes(l, r):
-    d = (l[0] - r[0], l[1] - r[1])
-    while d[0] % 2 == 0 and d[1] % 2 == 0:
-        d = (d[0] // 2, d[1] // 2)
 
-    anti_nodes = []
 
-    anti_node_l = l
-    while is_in_range(anti_node_l):
-        anti_nodes.append(anti_node_l)
-        anti_node_l = (anti_node_l[0] + d[0], anti_node_l[1] + d[1])
+AntennaPositions = dict[str, list[Vector]]
+City = tuple[Grid, AntennaPositions]
+
+# anything but empty ground, a character class so no antenna needs escaping
+antenna_re = re.compile(rb"[^.]")
+
+
+def parse(data: str) -> City:
+    city = Grid.parse(data, padding=0)
+
+    # a single scan over all cells
+    antenna_positions = {}
+    for match in antenna_re.finditer(city.cells):
+        position = city.coords(match.start())
+        antenna_positions.setdefault(match[0].decode(), []).append(position)
+
+    return city, antenna_positions
+
+
+class Antinodes(NamedTuple):
+    # 1 on every position with an antinode of any frequency, else 0
+    grid: Grid
+    # number of positions with an antinode of each frequency
+    per_frequency: dict[str, int]
+
+
+def find_antinodes(city: City, resonant: bool) -> Antinodes:
+    """
+    Goes over each pair of antennas of a frequency once. Without resonance the antinodes
+    are the two positions beyond the pair, with it every grid position on their line. Those
+    are evenly spaced, so they are marked with a single slice assignment each.
+    """
+    (city_map, antenna_positions) = city
+    (width, height) = (city_map.width, city_map.height)
+    antinodes = Grid(width, height, bytearray(len(city_map.cells)), padding=0)
+    cells = antinodes.cells
+    ones = b"\x01" * max(width, height)
+    per_frequency = {}
+
+    for antenna_type, positions in antenna_positions.items():
+        frequency_cells = bytearray(len(cells))
+        for l, r in itertools.combinations(positions, 2):
+            if resonant:
+                ((x, y), (dx, dy), count) = get_anti_node_line(l, r, antinodes)
+                flat_step = dy * antinodes.stride + dx
+                start = antinodes.index(x, y)
+                stop = start + flat_step * (count - 1) + 1
+                frequency_cells[start:stop:flat_step] = ones[:count]
+                cells[start:stop:flat_step] = ones[:count]
+            else:
+                d = (l[0] - r[0], l[1] - r[1])
+                for x, y in ((l[0] + d[0], l[1] + d[1]), (r[0] - d[0], r[1] - d[1])):
+                    if antinodes.in_range(x, y):
+                        frequency_cells[antinodes.index(x, y)] = 1
+                        cells[antinodes.index(x, y)] = 1
+        per_frequency[antenna_type] = frequency_cells.count(1)
+
+    return Antinodes(antinodes, per_frequency)
+
+
+def print_per_frequency(antinodes: Antinodes) -> None:
+    for antenna_type, count in sorted(antinodes.per_frequency.items()):
+        print(f"{antenna_type}: {count}")
+
+
+################################################################################################
+# Problem 1
+def part1(city: City) -> int:
+    antinodes = find_antinodes(city, resonant=False)
+    if cli.verbose:
+        print_per_frequency(antinodes)
+    return antinodes.grid.cells.count(1)
+
+
+################################################################################################
+# Problem 2
+def get_anti_node_line(l, r, grid: Grid):
+    """First position in the grid on the line through l and r, the step along it, the count"""
+    d = (l[0] - r[0], l[1] - r[1])
+    divisor = math.gcd(*d)
+    step = (d[0] // divisor, d[1] // divisor)
+    # pointing down or right, so the positions come in row by row order
+    if step[1] < 0 or (step[1] == 0 and step[0] < 0):
+        step = (-step[0], -step[1])
 
-    anti_node_r = (l[0] - d[0], l[1] - d[1])
-    while is_in_range(anti_node_r):
-        anti_nodes.append(anti_node_r)
-        anti_node_r = (anti_node_r[0] - d[0], anti_node_r[1] - d[1])
+    back = grid.steps_in_range(l[0], l[1], -step[0], -step[1])
+    first = (l[0] - step[0] * back, l[1] - step[1] * back)
+    return first, step, grid.steps_in_range(*first, *step) + 1
 
-    return anti_nodes
 
+def get_anti_nodes(l, r, grid: Grid):
+    ((x, y), (dx, dy), count) = get_anti_node_line(l, r, grid)
+    return [(x + dx * i, y + dy * i) for i in range(count)]
 
-for antenna_type, positions in antenna_positions.items():
-    pairwise_positions = itertools.product(positions, positions)
-    for l, r in pairwise_positions:
-        if l == r:
-            continue
 
-        anti_nodes = get_anti_nodes(l, r)
-        for x, y in anti_nodes:
-            real_anti_nodes[y][x].add(antenna_type)
+def part2(city: City) -> int:
+    antinodes = find_antinodes(city, resonant=True)
+    if cli.verbose:
+        print_per_frequency(antinodes)
+    return antinodes.grid.cells.count(1)
 
-real_anti_nodes_flat = list(itertools.chain.from_iterable(real_anti_nodes))
-num_positions_with_real_anti_nodes = len(
-    real_anti_nodes_flat
-) - real_anti_nodes_flat.count(set())
-print(f"Problem 2: {num_positions_with_real_anti_nodes}")
 
-if cli.visualize:
-    import math
+def visualize(city: City):
     import manim
     import pathlib
 
+    (city_map, antenna_positions) = city
+    (width, height) = (city_map.width, city_map.height)
+    real_anti_nodes = find_antinodes(city, resonant=True).grid
+
     colors = {
-        antenna_type: manim.random_bright_color() for antenna_type in antenna_types
+        antenna_type: manim.random_bright_color()
+        for antenna_type in antenna_positions.keys()
     }
 
     def align(mobject: manim.Mobject):
@@ -203,11 +235,12 @@ if cli.visualize:
                 a for a in self.antennas if a.position in first_antennas
             ]
 
-            first_anti_nodes = get_anti_nodes(*first_antennas)
+            first_anti_nodes = get_anti_nodes(*first_antennas, real_anti_nodes)
             other_anti_nodes = [
                 (x, y)
                 for (x, y) in itertools.product(range(0, width), range(0, height))
-                if real_anti_nodes[y][x] != set() and (x, y) not in first_anti_nodes
+                if real_anti_nodes[real_anti_nodes.index(x, y)]
+                and (x, y) not in first_anti_nodes
             ]
 
             self.first_anti_nodes = list(map(AntiNode, first_anti_nodes))
@@ -254,3 +287,15 @@ if cli.visualize:
     if cli.sample:
         manim.config.output_file = f"{manim.config.output_file}_sample"
     CityScene().render()
+
+
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
+
+    city = parse(data)
+    print(f"Problem 1: {part1(city)}")
+    print(f"Problem 2: {part2(city)}")
+
+    if cli.visualize:
+        visualize(city)
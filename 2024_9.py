@@ -1,11 +1,10 @@
-import aocd
 import collections
 
 import cli
+import inputs
 
 sample_data = """\
 2333133121414131402"""
-data = sample_data if cli.sample else aocd.data
 
 
 def checksum(blocks):
@@ -16,6 +15,10 @@ def checksum(blocks):
     return chk
 
 
+def parse(data: str) -> str:
+    return data.strip()
+
+
 ################################################################################################
 # Problem 1
 def get_next_non_empty_block(blocks, start):
@@ -24,22 +27,22 @@ def get_next_non_empty_block(blocks, start):
     return start
 
 
-blocks = [
-    str(id // 2) if id % 2 == 0 else "."
-    for id, block_size in enumerate(data)
-    for _ in range(int(block_size))
-]
-num_empty_blocks = blocks.count(".")
+def part1(disk_map: str) -> int:
+    blocks = [
+        str(id // 2) if id % 2 == 0 else "."
+        for id, block_size in enumerate(disk_map)
+        for _ in range(int(block_size))
+    ]
+    num_empty_blocks = blocks.count(".")
 
-blocks = blocks.copy()
-last_non_empty_block = len(blocks) - 1
-while blocks[-num_empty_blocks:].count(".") < num_empty_blocks:
-    first_empty_block = blocks.index(".")
-    last_non_empty_block = get_next_non_empty_block(blocks, last_non_empty_block)
-    blocks[first_empty_block] = blocks[last_non_empty_block]
-    blocks[last_non_empty_block] = "."
-
-print(f"Problem 1: {checksum(blocks)}")
+    blocks = blocks.copy()
+    last_non_empty_block = len(blocks) - 1
+    while blocks[-num_empty_blocks:].count(".") < num_empty_blocks:
+        first_empty_block = blocks.index(".")
+        last_non_empty_block = get_next_non_empty_block(blocks, last_non_empty_block)
+        blocks[first_empty_block] = blocks[last_non_empty_block]
+        blocks[last_non_empty_block] = "."
+    return checksum(blocks)
 
 
 ################################################################################################
@@ -56,38 +59,48 @@ def make_entry(size, idx):
     return Entry(size, idx)
 
 
-disk = [make_entry(int(f), i) for i, f in enumerate(data)]
-file_idx = len(disk) - 1 if len(disk) % 2 != 0 else len(disk) - 2
-while file_idx > 0:
-    # Find index of empty block range that fits this file
-    empty_idx = 1
-    while empty_idx < file_idx and disk[empty_idx].size < disk[file_idx].size:
-        empty_idx += 2
-
-    # Move file if we found an index
-    if empty_idx < file_idx:
-        # Insert file entry in the new position
-        disk[empty_idx : empty_idx + 1] = [
-            make_entry(0, -1),
-            disk[file_idx],
-            make_entry(disk[empty_idx].size - disk[file_idx].size, -1),
-        ]
-        file_idx += 2
-
-        # Remove file entry
-        disk[file_idx - 1].size += disk[file_idx].size
-        del disk[file_idx]
-
-        # Compact adjacent empty entries
-        if file_idx < len(disk) - 1:
+def part2(disk_map: str) -> int:
+    disk = [make_entry(int(f), i) for i, f in enumerate(disk_map)]
+    file_idx = len(disk) - 1 if len(disk) % 2 != 0 else len(disk) - 2
+    while file_idx > 0:
+        # Find index of empty block range that fits this file
+        empty_idx = 1
+        while empty_idx < file_idx and disk[empty_idx].size < disk[file_idx].size:
+            empty_idx += 2
+
+        # Move file if we found an index
+        if empty_idx < file_idx:
+            # Insert file entry in the new position
+            disk[empty_idx : empty_idx + 1] = [
+                make_entry(0, -1),
+                disk[file_idx],
+                make_entry(disk[empty_idx].size - disk[file_idx].size, -1),
+            ]
+            file_idx += 2
+
+            # Remove file entry
             disk[file_idx - 1].size += disk[file_idx].size
             del disk[file_idx]
 
-        # Remove zero-length entries at the back of the list
-        if disk[-1] == 0:
-            del disk[-1]
+            # Compact adjacent empty entries
+            if file_idx < len(disk) - 1:
+                disk[file_idx - 1].size += disk[file_idx].size
+                del disk[file_idx]
+
+            # Remove zero-length entries at the back of the list
+            if disk[-1] == 0:
+                del disk[-1]
+
+        file_idx -= 2
+
+    defragmented_blocks = [str(block) for block in disk for _ in range(block.size)]
+    return checksum(defragmented_blocks)
+
 
-    file_idx -= 2
+if __name__ == "__main__":
+    cli.parse_args(__file__)
+    data = sample_data if cli.sample else inputs.get_data(cli.day)
 
-defragmented_blocks = [str(block) for block in disk for _ in range(block.size)]
-print(f"Problem 2: {checksum(defragmented_blocks)}")
+    disk_map = parse(data)
+    print(f"Problem 1: {part1(disk_map)}")
+    print(f"Problem 2: {part2(disk_map)}")
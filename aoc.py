@@ -0,0 +1,256 @@
+import argparse
+import importlib
+import pathlib
+import time
+
+import cli
+import inputs
+import metrics
+import profiling
+
+
+def parse_days(days: str) -> list[int]:
+    selected_days = []
+    for days_range in days.split(","):
+        first, _, last = days_range.partition("-")
+        selected_days.extend(range(int(first), int(last or first) + 1))
+    return selected_days
+
+
+def parse_scales(scales: str) -> list[float]:
+    return list(map(float, scales.split(",")))
+
+
+def load_day(day: int):
+    return importlib.import_module(f"2024_{day}")
+
+
+def solve(module, data: str) -> tuple:
+    name = module.__name__
+    parse = profiling.wrap(f"{name}_parse", module.parse)
+    parsed = parse(data)
+    part1 = profiling.wrap(f"{name}_part1", module.part1)(parsed)
+
+    # some days come with a separate sample for the second problem
+    if cli.sample and hasattr(module, "sample_data_2"):
+        parsed = parse(module.sample_data_2)
+    part2 = profiling.wrap(f"{name}_part2", module.part2)(parsed)
+    return part1, part2
+
+
+def run(days: list[int]) -> bool:
+    all_solved = True
+    total_time = 0.0
+    for day in days:
+        module = load_day(day)
+        try:
+            data = module.sample_data if cli.sample else inputs.get_data(day)
+        except inputs.InputError as e:
+            print(f"Day {day:>2}: {e}")
+            all_solved = False
+            continue
+
+        start = time.perf_counter()
+        try:
+            part1, part2 = solve(module, data)
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            print(f"Day {day:>2}: failed with {type(e).__name__}: {e} ({elapsed:.3f}s)")
+            all_solved = False
+        else:
+            elapsed = time.perf_counter() - start
+            print(f"Day {day:>2}: {part1} | {part2} ({elapsed:.3f}s)")
+        total_time += elapsed
+        metrics.collect(str(day))
+
+    print(f"Total: {total_time:.3f}s")
+    return all_solved
+
+
+def save_profiles(directory: pathlib.Path) -> None:
+    for path in profiling.save(directory):
+        print(f"Saved profile to {path}")
+
+
+def fetch(days: list[int], force: bool) -> bool:
+    for day in days:
+        print(f"Day {day:>2}: {inputs.fetch(day, force=force)}")
+    return True
+
+
+def add_solve_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "days",
+        nargs="?",
+        default="1-25",
+        help="Days to solve, e.g. '1-25' or '1,3,5-7'.",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Print out verbose info."
+    )
+    parser.add_argument(
+        "-s", "--sample", action="store_true", help="Use sample data if available."
+    )
+    parser.add_argument(
+        "--input-dir",
+        metavar="DIR",
+        help="Read cached puzzle inputs from this directory.",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Only use cached inputs, never fetch them.",
+    )
+    parser.add_argument(
+        "--progress", action="store_true", help="Show progress of long loops."
+    )
+    parser.add_argument(
+        "--profile",
+        choices=profiling.profilers.keys(),
+        help="Profile parsing and both parts, collected over all runs of a day.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        metavar="DIR",
+        type=pathlib.Path,
+        default=pathlib.Path("profiles"),
+        help="Write profiles to this directory.",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        nargs="?",
+        const="-",
+        help="Count the work searches and simulations do, as JSON to PATH or stdout.",
+    )
+
+
+def apply_solve_arguments(args: argparse.Namespace) -> None:
+    cli.verbose = args.verbose
+    cli.sample = args.sample
+    cli.offline = args.offline
+    cli.progress = args.progress
+    cli.profile = args.profile
+    metrics.enabled = args.metrics is not None
+    if args.input_dir is not None:
+        inputs.input_dir = pathlib.Path(args.input_dir)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="Advent of Code 2024",
+        description="Solves the Advent of Code problems of many days in one process",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Solve the given days.")
+    add_solve_arguments(run_parser)
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Benchmark parsing and both parts of the given days."
+    )
+    add_solve_arguments(bench_parser)
+    bench_parser.add_argument(
+        "-n",
+        "--repetitions",
+        type=int,
+        default=10,
+        help="How often each part is run.",
+    )
+    bench_parser.add_argument(
+        "--save", metavar="PATH", type=pathlib.Path, help="Write results as JSON."
+    )
+    bench_parser.add_argument(
+        "--baseline",
+        metavar="PATH",
+        type=pathlib.Path,
+        help="Fail if a part got slower than in this JSON baseline.",
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed slowdown against the baseline, e.g. 0.1 for 10%%.",
+    )
+    bench_parser.add_argument(
+        "--scale",
+        type=parse_scales,
+        help="Benchmark on generated inputs of these scales instead, e.g. '1,2,4'.",
+    )
+    bench_parser.add_argument(
+        "--seed", type=int, default=0, help="Seed for generated inputs."
+    )
+
+    generate_parser = subparsers.add_parser(
+        "generate", help="Print a generated input for the given day."
+    )
+    generate_parser.add_argument("day", type=int, help="Day to generate input for.")
+    generate_parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Size relative to the real input, e.g. 10 for ten times as large.",
+    )
+    generate_parser.add_argument(
+        "--seed", type=int, default=0, help="Seed for the generator."
+    )
+    generate_parser.add_argument(
+        "-o", "--output", metavar="PATH", type=pathlib.Path, help="Write to this file."
+    )
+
+    fetch_parser = subparsers.add_parser(
+        "fetch", help="Download the inputs of the given days into the local cache."
+    )
+    fetch_parser.add_argument(
+        "days",
+        nargs="?",
+        default="1-25",
+        help="Days to fetch, e.g. '1-25' or '1,3,5-7'.",
+    )
+    fetch_parser.add_argument(
+        "-f", "--force", action="store_true", help="Fetch even if already cached."
+    )
+
+    args = parser.parse_args()
+
+    match args.command:
+        case "run":
+            apply_solve_arguments(args)
+            solved = run(parse_days(args.days))
+            save_profiles(args.profile_dir)
+            if metrics.enabled:
+                metrics.save(args.metrics)
+            return 0 if solved else 1
+        case "bench":
+            import bench
+
+            apply_solve_arguments(args)
+            modules = {day: load_day(day) for day in parse_days(args.days)}
+            passed = bench.bench(
+                modules,
+                args.repetitions,
+                baseline_path=args.baseline,
+                save_path=args.save,
+                threshold=args.threshold,
+                scales=args.scale,
+                seed=args.seed,
+            )
+            save_profiles(args.profile_dir)
+            if metrics.enabled:
+                metrics.save(args.metrics)
+            return 0 if passed else 1
+        case "generate":
+            import generators
+
+            data = generators.generate(args.day, args.scale, args.seed)
+            if args.output is not None:
+                args.output.write_text(data + "\n")
+            else:
+                print(data)
+            return 0
+        case "fetch":
+            return 0 if fetch(parse_days(args.days), args.force) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
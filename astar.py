@@ -5,8 +5,12 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Iterable, Union, TypeVar, Generic
 from math import inf as infinity
+from array import array
+from heapq import heappush, heappop
 import sortedcontainers  # type: ignore
 
+import metrics
+
 # introduce generic type
 T = TypeVar("T")
 
@@ -15,7 +19,16 @@ T = TypeVar("T")
 class SearchNode(Generic[T]):
     """Representation of a search node"""
 
-    __slots__ = ("data", "gscore", "fscore", "closed", "came_from", "in_openset")
+    __slots__ = (
+        "data",
+        "gscore",
+        "fscore",
+        "closed",
+        "came_from",
+        "in_openset",
+        "generation",
+        "predecessors",
+    )
 
     def __init__(
         self, data: T, gscore: float = infinity, fscore: float = infinity
@@ -25,7 +38,9 @@ class SearchNode(Generic[T]):
         self.fscore = fscore
         self.closed = False
         self.in_openset = False
+        self.generation = 0
         self.came_from: Union[None, SearchNode[T]] = None
+        self.predecessors: Union[None, list[SearchNode[T]]] = None
 
     def __lt__(self, b: "SearchNode[T]") -> bool:
         """Natural order is based on the fscore value & is used by heapq operations"""
@@ -47,12 +62,16 @@ SNType = TypeVar("SNType", bound=SearchNode)
 
 
 class OpenSet(Generic[SNType]):
+    # removed items are really removed, nothing stale is ever popped
+    stale_pops = 0
 
     def __init__(self) -> None:
         self.sortedlist = sortedcontainers.SortedList(key=lambda x: x.fscore)
+        self.pushes = 0
 
     def push(self, item: SNType) -> None:
         item.in_openset = True
+        self.pushes += 1
         self.sortedlist.add(item)
 
     def pop(self) -> SNType:
@@ -68,12 +87,63 @@ class OpenSet(Generic[SNType]):
         return len(self.sortedlist)
 
 
+class HeapOpenSet(Generic[SNType]):
+    """
+    Open set on a binary heap without decrease-key. Removing or re-pushing a node leaves its
+    old entry in the heap, entries whose generation doesn't match the node anymore are
+    skipped when popping. Nodes with equal fscore are popped in insertion order.
+    """
+
+    def __init__(self) -> None:
+        self.heap: list[tuple[float, int, int, SNType]] = []
+        self.size = 0
+        # doubles as the tie breaker
+        self.pushes = 0
+        self.stale_pops = 0
+
+    def push(self, item: SNType) -> None:
+        item.in_openset = True
+        item.generation += 1
+        self.size += 1
+        self.pushes += 1
+        heappush(self.heap, (item.fscore, self.pushes, item.generation, item))
+
+    def pop(self) -> SNType:
+        while True:
+            (_, _, generation, item) = heappop(self.heap)
+            if item.in_openset and item.generation == generation:
+                item.in_openset = False
+                self.size -= 1
+                return item
+            self.stale_pops += 1
+
+    def remove(self, item: SNType) -> None:
+        item.in_openset = False
+        self.size -= 1
+
+    def __len__(self) -> int:
+        return self.size
+
+
+open_sets = {
+    "sorted": OpenSet,
+    "heap": HeapOpenSet,
+}
+
+
 ################################################################################*
 
 
 class AStar(ABC, Generic[T]):
     __slots__ = ()
 
+    def __init__(self, open_set: str = "heap") -> None:
+        """
+        open_set selects the priority queue, either "heap" for a binary heap with lazy
+        deletion or "sorted" for a SortedList.
+        """
+        self.open_set = open_sets[open_set]
+
     @abstractmethod
     def heuristic_cost_estimate(self, current: T, goal: T) -> float:
         """
@@ -83,23 +153,31 @@ class AStar(ABC, Generic[T]):
         """
         raise NotImplementedError
 
-    @abstractmethod
     def distance_between(self, n1: T, n2: T) -> float:
         """
         Gives the real distance between two adjacent nodes n1 and n2 (i.e n2
         belongs to the list of n1's neighbors).
         n2 is guaranteed to belong to the list returned by the call to neighbors(n1).
-        This method must be implemented in a subclass.
+        This method must be implemented in a subclass, unless edges is.
         """
+        raise NotImplementedError
 
-    @abstractmethod
     def neighbors(self, node: T) -> Iterable[T]:
         """
         For a given node, returns (or yields) the list of its neighbors.
-        This method must be implemented in a subclass.
+        This method must be implemented in a subclass, unless edges is.
         """
         raise NotImplementedError
 
+    def edges(self, node: T) -> Iterable[tuple[T, float]]:
+        """
+        For a given node, returns (or yields) its neighbors together with the cost to get
+        there. Overwrite this instead of neighbors and distance_between when the cost is
+        known while generating neighbors, or when nodes are composite states such as
+        (position, heading) whose edge costs depend on the whole state.
+        """
+        return ((n, self.distance_between(node, n)) for n in self.neighbors(node))
+
     def is_goal_reached(self, current: T, goal: T) -> bool:
         """
         Returns true when we can consider that 'current' is the goal.
@@ -126,45 +204,42 @@ class AStar(ABC, Generic[T]):
         if self.is_goal_reached(start, goal):
             return [start]
 
-        openSet: OpenSet[SearchNode[T]] = OpenSet()
+        openSet: OpenSet[SearchNode[T]] = self.open_set()
         searchNodes: SearchNodeDict[T] = SearchNodeDict()
         startNode = searchNodes[start] = SearchNode(
             start, gscore=0.0, fscore=self.heuristic_cost_estimate(start, goal)
         )
         openSet.push(startNode)
 
+        track = metrics.enabled
+        peak = 0
         while openSet:
-            self.current = openSet.pop()
+            if track:
+                peak = max(peak, len(openSet))
+            current = openSet.pop()
 
-            if self.is_goal_reached(self.current.data, goal):
-                return (
-                    self.reconstruct_path(self.current, reversePath),
-                    self.current.gscore,
-                )
+            if self.is_goal_reached(current.data, goal):
+                if track:
+                    self.report_metrics(openSet, searchNodes, peak)
+                return (self.reconstruct_path(current, reversePath), current.gscore)
 
-            self.current.closed = True
+            current.closed = True
 
-            for neighbor in map(
-                lambda n: searchNodes[n], self.neighbors(self.current.data)
-            ):
+            for data, cost in self.edges(current.data):
+                neighbor = searchNodes[data]
                 if neighbor.closed:
                     continue
 
-                tentative_gscore = self.current.gscore + self.distance_between(
-                    self.current.data, neighbor.data
-                )
-
+                tentative_gscore = current.gscore + cost
                 if tentative_gscore >= neighbor.gscore:
                     continue
 
-                neighbor_from_openset = neighbor.in_openset
-
-                if neighbor_from_openset:
+                if neighbor.in_openset:
                     # we have to remove the item from the heap, as its score has changed
                     openSet.remove(neighbor)
 
                 # update the node
-                neighbor.came_from = self.current
+                neighbor.came_from = current
                 neighbor.gscore = tentative_gscore
                 neighbor.fscore = tentative_gscore + self.heuristic_cost_estimate(
                     neighbor.data, goal
@@ -172,4 +247,253 @@ class AStar(ABC, Generic[T]):
 
                 openSet.push(neighbor)
 
+        if track:
+            self.report_metrics(openSet, searchNodes, peak)
         return None
+
+    def all_optimal_paths(self, start: T, goal: T) -> Union[tuple[set[T], float], None]:
+        """
+        Like astar, but keeps searching until all optimal paths are found. Every node records
+        all predecessors it can be optimally reached from, instead of a single came_from.
+        Returns the union of the nodes on all optimal paths and their cost.
+        """
+        openSet: OpenSet[SearchNode[T]] = self.open_set()
+        searchNodes: SearchNodeDict[T] = SearchNodeDict()
+        startNode = searchNodes[start] = SearchNode(
+            start, gscore=0.0, fscore=self.heuristic_cost_estimate(start, goal)
+        )
+        # zero-cost edges can lead back into the start, which was never relaxed
+        startNode.predecessors = []
+        openSet.push(startNode)
+
+        goalNodes: list[SearchNode[T]] = []
+        track = metrics.enabled
+        peak = 0
+        while openSet:
+            if track:
+                peak = max(peak, len(openSet))
+            current = openSet.pop()
+
+            # everything left is more expensive than the paths we found
+            if goalNodes and current.fscore > goalNodes[0].gscore:
+                break
+
+            if self.is_goal_reached(current.data, goal):
+                goalNodes.append(current)
+                continue
+
+            current.closed = True
+
+            for data, cost in self.edges(current.data):
+                neighbor = searchNodes[data]
+                tentative_gscore = current.gscore + cost
+
+                # another optimal way into this node, closed or not
+                if tentative_gscore == neighbor.gscore:
+                    neighbor.predecessors.append(current)
+                    continue
+
+                if neighbor.closed or tentative_gscore > neighbor.gscore:
+                    continue
+
+                if neighbor.in_openset:
+                    openSet.remove(neighbor)
+
+                neighbor.came_from = current
+                neighbor.predecessors = [current]
+                neighbor.gscore = tentative_gscore
+                neighbor.fscore = tentative_gscore + self.heuristic_cost_estimate(
+                    neighbor.data, goal
+                )
+
+                openSet.push(neighbor)
+
+        if track:
+            self.report_metrics(openSet, searchNodes, peak)
+        if not goalNodes:
+            return None
+
+        visited = {id(node): node for node in goalNodes}
+        stack = list(goalNodes)
+        while stack:
+            for predecessor in stack.pop().predecessors or []:
+                if id(predecessor) not in visited:
+                    visited[id(predecessor)] = predecessor
+                    stack.append(predecessor)
+
+        return ({node.data for node in visited.values()}, goalNodes[0].gscore)
+
+    def report_metrics(
+        self, openSet: OpenSet, searchNodes: SearchNodeDict[T], peak: int
+    ) -> None:
+        metrics.count("astar.searches")
+        metrics.count("astar.expanded", sum(n.closed for n in searchNodes.values()))
+        metrics.count("astar.pushes", openSet.pushes)
+        metrics.count("astar.stale_pops", openSet.stale_pops)
+        metrics.maximum("astar.open_set_peak", peak)
+
+
+################################################################################
+class GridAStar:
+    """
+    A-Star specialized for 4-connected grids. Nodes are flat `y * width + x` ints, scores and
+    parents live in arrays and neighbors are generated inline, so there are no per-node
+    objects and no method calls per edge. `passable` holds one truthy byte per cell.
+
+    With a `turn_cost` nodes also carry a heading and every 90° turn costs that much on top
+    of the step, internally the states are `cell * 4 + heading`.
+    """
+
+    # headings, in clockwise order so turning is +-1
+    steps = ((1, 0), (0, 1), (-1, 0), (0, -1))
+    unreached = 2**31 - 1
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        passable: bytes | bytearray,
+        turn_cost: int = 0,
+        start_heading: int = 0,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.passable = passable
+        self.turn_cost = turn_cost
+        self.start_heading = start_heading
+        self.headings = 4 if turn_cost else 1
+
+    def node(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def coords(self, node: int) -> tuple[int, int]:
+        return (node % self.width, node // self.width)
+
+    def astar(self, start: int, goal: int) -> Union[tuple[list[int], int], None]:
+        (goal_states, gscore, came_from, _) = self.search(start, goal, False)
+        if not goal_states:
+            return None
+
+        last = goal_states[0]
+        return (self.reconstruct_path(came_from, last), gscore[last])
+
+    def all_optimal_paths(
+        self, start: int, goal: int
+    ) -> Union[tuple[set[int], int], None]:
+        """
+        Returns the union of the cells on all optimal paths and their cost. Every state keeps
+        all of its optimal predecessors, walking those back from the goal covers all paths.
+        """
+        (goal_states, gscore, came_from, more_came_from) = self.search(
+            start, goal, True
+        )
+        if not goal_states:
+            return None
+
+        visited = set(goal_states)
+        stack = list(goal_states)
+        while stack:
+            state = stack.pop()
+            predecessors = more_came_from.get(state, [])
+            if came_from[state] != -1:
+                predecessors = [came_from[state], *predecessors]
+            for predecessor in predecessors:
+                if predecessor not in visited:
+                    visited.add(predecessor)
+                    stack.append(predecessor)
+
+        cells = {state // self.headings for state in visited}
+        return (cells, gscore[goal_states[0]])
+
+    def search(
+        self, start: int, goal: int, all_paths: bool
+    ) -> tuple[list[int], array, array, dict[int, list[int]]]:
+        width = self.width
+        height = self.height
+        passable = self.passable
+        turn_cost = self.turn_cost
+        headings = self.headings
+        (goal_x, goal_y) = self.coords(goal)
+
+        num_states = width * height * headings
+        gscore = array("l", [self.unreached]) * num_states
+        came_from = array("l", [-1]) * num_states
+        closed = bytearray(num_states)
+
+        # only ties go in here, the first optimal predecessor is in came_from
+        more_came_from: dict[int, list[int]] = {}
+        goal_states: list[int] = []
+
+        start_state = start * headings + (self.start_heading if turn_cost else 0)
+        gscore[start_state] = 0
+        open_heap = [(0, start_state)]
+        track = metrics.enabled
+        pops = peak = 0
+        while open_heap:
+            if track:
+                pops += 1
+                peak = max(peak, len(open_heap))
+            (fscore, state) = heappop(open_heap)
+            if closed[state]:
+                continue
+            closed[state] = 1
+
+            (cell, heading) = divmod(state, headings)
+            if cell == goal:
+                if not all_paths:
+                    goal_states.append(state)
+                    break
+
+                # the goal may be reached in several headings, keep those that are optimal
+                if goal_states and gscore[state] > gscore[goal_states[0]]:
+                    break
+                goal_states.append(state)
+                continue
+
+            if goal_states and fscore > gscore[goal_states[0]]:
+                break
+
+            gscore_here = gscore[state]
+            x = cell % width
+            y = cell // width
+            for next_heading, (dx, dy) in enumerate(self.steps):
+                next_x = x + dx
+                next_y = y + dy
+                if next_x < 0 or next_y < 0 or next_x >= width or next_y >= height:
+                    continue
+                next_cell = next_y * width + next_x
+                if not passable[next_cell]:
+                    continue
+
+                tentative_gscore = gscore_here + 1
+                if turn_cost:
+                    turns = (next_heading - heading) % 4
+                    tentative_gscore += turn_cost * (2 if turns == 2 else turns % 2)
+                next_state = next_cell * headings + (next_heading if turn_cost else 0)
+
+                if tentative_gscore < gscore[next_state]:
+                    gscore[next_state] = tentative_gscore
+                    came_from[next_state] = state
+                    if all_paths:
+                        more_came_from.pop(next_state, None)
+                    heuristic = abs(next_x - goal_x) + abs(next_y - goal_y)
+                    heappush(open_heap, (tentative_gscore + heuristic, next_state))
+                elif all_paths and tentative_gscore == gscore[next_state]:
+                    more_came_from.setdefault(next_state, []).append(state)
+
+        if track:
+            # everything pushed was either popped or is still in the heap
+            expanded = closed.count(1)
+            metrics.count("grid_astar.searches")
+            metrics.count("grid_astar.expanded", expanded)
+            metrics.count("grid_astar.pushes", pops + len(open_heap))
+            metrics.count("grid_astar.stale_pops", pops - expanded)
+            metrics.maximum("grid_astar.open_set_peak", peak)
+        return (goal_states, gscore, came_from, more_came_from)
+
+    def reconstruct_path(self, came_from: array, last: int) -> list[int]:
+        path = []
+        while last != -1:
+            path.append(last // self.headings)
+            last = came_from[last]
+        return list(reversed(path))
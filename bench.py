@@ -0,0 +1,176 @@
+import json
+import pathlib
+import statistics
+import time
+import tracemalloc
+from types import ModuleType
+from typing import Callable
+
+import cli
+import inputs
+import metrics
+import profiling
+
+if __name__ == "__main__":
+    print("Can't run bench.py on its own, use 'python -m aoc bench'...")
+    exit(1)
+
+# {"1": {"parse": {"min": ..., "median": ..., "p95": ..., "peak": ...}, ...}, ...}
+PhaseStats = dict[str, int]
+DayStats = dict[str, PhaseStats]
+Baseline = dict[str, DayStats]
+
+
+def clear_caches(module: ModuleType) -> None:
+    # days memoize with functools.cache, without this only the first repetition does work
+    for obj in vars(module).values():
+        if hasattr(obj, "cache_clear"):
+            obj.cache_clear()
+
+
+def percentile(samples: list[int], p: float) -> int:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def time_phase(module: ModuleType, func: Callable, repetitions: int) -> list[int]:
+    samples = []
+    for _ in range(repetitions):
+        clear_caches(module)
+        start = time.perf_counter_ns()
+        func()
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def peak_memory(module: ModuleType, func: Callable) -> int:
+    # tracing slows everything down a lot, so memory is measured in a separate run
+    clear_caches(module)
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_day(
+    module: ModuleType, data: str, repetitions: int, name: str | None = None
+) -> DayStats:
+    name = name or module.__name__
+    parsed = module.parse(data)
+    parsed_2 = parsed
+    if cli.sample and hasattr(module, "sample_data_2"):
+        parsed_2 = module.parse(module.sample_data_2)
+
+    phases = {
+        "parse": (module.parse, data),
+        "part1": (module.part1, parsed),
+        "part2": (module.part2, parsed_2),
+    }
+
+    day_stats: DayStats = {}
+    for phase, (func, arg) in phases.items():
+        # profiles collect over all repetitions, but not the memory run
+        profiled = profiling.wrap(f"{name}_{phase}", func)
+        samples = time_phase(module, lambda: profiled(arg), repetitions)
+        day_stats[phase] = {
+            "min": min(samples),
+            "median": int(statistics.median(samples)),
+            "p95": percentile(samples, 0.95),
+            "peak": peak_memory(module, lambda: func(arg)),
+        }
+    return day_stats
+
+
+def format_ns(ns: int) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f}{unit}"
+    return f"{ns}ns"
+
+
+def format_bytes(num: int) -> str:
+    for unit, scale in (("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if num >= scale:
+            return f"{num / scale:.1f}{unit}"
+    return f"{num}B"
+
+
+def find_regressions(
+    results: Baseline, baseline: Baseline, threshold: float
+) -> list[str]:
+    regressions = []
+    for day, day_stats in results.items():
+        for phase, stats in day_stats.items():
+            if day not in baseline or phase not in baseline[day]:
+                continue
+
+            # medians are compared, mins are too optimistic and p95 too noisy
+            before = baseline[day][phase]["median"]
+            after = stats["median"]
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append(
+                    f"Day {day} {phase}: {format_ns(before)} -> {format_ns(after)} "
+                    f"(+{(after / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def bench(
+    modules: dict[int, ModuleType],
+    repetitions: int,
+    baseline_path: pathlib.Path | None = None,
+    save_path: pathlib.Path | None = None,
+    threshold: float = 0.1,
+    scales: list[float] | None = None,
+    seed: int = 0,
+) -> bool:
+    results: Baseline = {}
+    all_solved = True
+    for day, module in modules.items():
+        # synthetic inputs are stored under their own key, they don't compare to real ones
+        runs = [(str(day), None)]
+        if scales:
+            runs = [(f"{day}@{scale:g}", scale) for scale in scales]
+
+        for key, scale in runs:
+            name = f"{module.__name__}@{scale:g}" if scale is not None else None
+            label = f"Day {day:>2}" if scale is None else f"Day {day:>2} x{scale:<5g}"
+            try:
+                if scale is not None:
+                    import generators
+
+                    data = generators.generate(day, scale, seed)
+                else:
+                    data = module.sample_data if cli.sample else inputs.get_data(day)
+                results[key] = bench_day(module, data, repetitions, name)
+                # summed over all repetitions and the memory run
+                metrics.collect(key)
+            except Exception as e:
+                print(f"{label}: failed with {type(e).__name__}: {e}")
+                all_solved = False
+                continue
+
+            for phase, stats in results[key].items():
+                print(
+                    f"{label} {phase}: "
+                    f"min {format_ns(stats['min']):>9} "
+                    f"median {format_ns(stats['median']):>9} "
+                    f"p95 {format_ns(stats['p95']):>9} "
+                    f"peak {format_bytes(stats['peak']):>9}"
+                )
+
+    if save_path is not None:
+        save_path.write_text(json.dumps(results, indent=2))
+        print(f"Saved baseline to {save_path}")
+
+    if baseline_path is not None:
+        baseline = json.loads(baseline_path.read_text())
+        regressions = find_regressions(results, baseline, threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return False
+
+    return all_solved
@@ -1,35 +1,58 @@
 import argparse
-import inspect
 import pathlib
 
 if __name__ == "__main__":
     print("Can't run cli.py on its own...")
     exit(1)
 
-for frame in inspect.stack()[1:]:
-    if frame.filename[0] != "<":
-        prog_name = f'Advent of Code 2024 - Day {pathlib.Path(frame.filename).stem.split("_")[1]}'
-        break
-
-__parser__ = argparse.ArgumentParser(
-    prog=prog_name,
-    description="Solves the Advent of Code problems of the given day",
-)
-__parser__.add_argument(
-    "-v", "--verbose", action="store_true", help="Print out verbose info."
-)
-__parser__.add_argument(
-    "-i",
-    "--visualize",
-    action="store_true",
-    help="Show problem visualization, if available.",
-)
-__parser__.add_argument(
-    "-s", "--sample", action="store_true", help="Use sample data if available."
-)
-
-__args__ = __parser__.parse_args()
-
-verbose = __args__.verbose
-visualize = __args__.visualize
-sample = __args__.sample
+verbose = False
+visualize = False
+sample = False
+input_path = None
+offline = False
+day = None
+profile = None
+progress = False
+
+
+def parse_args(day_file: str) -> None:
+    global verbose, visualize, sample, input_path, offline, day, progress
+
+    day = int(pathlib.Path(day_file).stem.split("_")[1])
+
+    parser = argparse.ArgumentParser(
+        prog=f"Advent of Code 2024 - Day {day}",
+        description="Solves the Advent of Code problems of the given day",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Print out verbose info."
+    )
+    parser.add_argument(
+        "-i",
+        "--visualize",
+        action="store_true",
+        help="Show problem visualization, if available.",
+    )
+    parser.add_argument(
+        "-s", "--sample", action="store_true", help="Use sample data if available."
+    )
+    parser.add_argument(
+        "--input", metavar="PATH", help="Read the puzzle input from this file."
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Only use cached inputs, never fetch them.",
+    )
+    parser.add_argument(
+        "--progress", action="store_true", help="Show progress of long loops."
+    )
+
+    args = parser.parse_args()
+
+    verbose = args.verbose
+    visualize = args.visualize
+    sample = args.sample
+    input_path = args.input
+    offline = args.offline
+    progress = args.progress
@@ -0,0 +1,599 @@
+import math
+import random
+import string
+from collections import deque
+from typing import Callable
+
+if __name__ == "__main__":
+    print("Can't run generators.py on its own, use 'python -m aoc generate'...")
+    exit(1)
+
+# Every generator produces a valid puzzle input for its day. The scale factor multiplies the
+# natural size of the input, i.e. the number of lines for list-like inputs or the side length
+# for grids. Scale 1 is roughly the size of the real puzzle input.
+Generator = Callable[[random.Random, float], str]
+
+generators: dict[int, Generator] = {}
+
+
+def generator(day: int):
+    def register(func: Generator) -> Generator:
+        generators[day] = func
+        return func
+
+    return register
+
+
+def scaled(size: int, scale: float, minimum: int = 1) -> int:
+    return max(minimum, int(size * scale))
+
+
+def odd(size: int) -> int:
+    return size if size % 2 == 1 else size + 1
+
+
+def grid_to_str(grid: list[bytearray]) -> str:
+    return "\n".join(row.decode() for row in grid)
+
+
+def generate(day: int, scale: float = 1.0, seed: int = 0) -> str:
+    if day not in generators:
+        raise ValueError(f"No input generator for day {day}")
+    return generators[day](random.Random(seed), scale)
+
+
+################################################################################################
+# Mazes, shared by days 16 and 20
+def carve_maze(rng: random.Random, size: int) -> list[bytearray]:
+    # randomized depth first search over the cells with odd coordinates, leaves a perfect maze
+    maze = [bytearray(b"#" * size) for _ in range(size)]
+    stack = [(1, 1)]
+    maze[1][1] = ord(".")
+    while stack:
+        (x, y) = stack[-1]
+        unvisited = [
+            (dx, dy)
+            for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if 0 < x + dx < size - 1
+            and 0 < y + dy < size - 1
+            and maze[y + dy][x + dx] == ord("#")
+        ]
+        if not unvisited:
+            stack.pop()
+            continue
+
+        (dx, dy) = rng.choice(unvisited)
+        maze[y + dy // 2][x + dx // 2] = ord(".")
+        maze[y + dy][x + dx] = ord(".")
+        stack.append((x + dx, y + dy))
+    return maze
+
+
+def bfs_path(
+    maze: list[bytearray], start: tuple[int, int], end: tuple[int, int] | None = None
+) -> list[tuple[int, int]]:
+    # path to end, or to the furthest reachable cell if there is no end
+    came_from = {start: None}
+    queue = deque([start])
+    last = start
+    while queue:
+        last = queue.popleft()
+        if last == end:
+            break
+
+        (x, y) = last
+        for next in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if next not in came_from and maze[next[1]][next[0]] != ord("#"):
+                came_from[next] = last
+                queue.append(next)
+
+    path = []
+    while last is not None:
+        path.append(last)
+        last = came_from[last]
+    return list(reversed(path))
+
+
+################################################################################################
+# Days
+@generator(1)
+def generate_day_1(rng: random.Random, scale: float) -> str:
+    lines = scaled(1000, scale)
+    left = [rng.randrange(10000, 100000) for _ in range(lines)]
+    # reuse some of the left numbers so the similarity score is not zero
+    right = [
+        rng.choice(left) if rng.random() < 0.3 else rng.randrange(10000, 100000)
+        for _ in range(lines)
+    ]
+    return "\n".join(f"{l}   {r}" for l, r in zip(left, right))
+
+
+@generator(2)
+def generate_day_2(rng: random.Random, scale: float) -> str:
+    reports = []
+    for _ in range(scaled(1000, scale)):
+        length = rng.randint(5, 8)
+        sign = rng.choice((-1, 1))
+        level = rng.randint(30, 70)
+        report = [level]
+        for _ in range(length - 1):
+            level += sign * rng.randint(1, 3)
+            report.append(level)
+
+        # break some reports, once to be fixed by the dampener, or more often to stay unsafe
+        for _ in range(rng.choice((0, 0, 1, 1, 2))):
+            i = rng.randrange(length)
+            report[i] = max(1, report[i] + rng.choice((-5, -1, 0, 4)))
+        reports.append(" ".join(map(str, report)))
+    return "\n".join(reports)
+
+
+@generator(3)
+def generate_day_3(rng: random.Random, scale: float) -> str:
+    def chunk() -> str:
+        a, b = rng.randint(1, 999), rng.randint(1, 999)
+        return rng.choice(
+            (
+                f"mul({a},{b})",
+                f"mul({a},{b})",
+                f"mul({a},{b})",
+                f"mul[{a},{b}]",
+                f"mul({a}, {b})",
+                f"mul ( {a},{b} )",
+                f"mul({a},{b}!",
+                "do()",
+                "don't()",
+                "don't",
+                "".join(rng.choices(string.punctuation.replace("\\", "") + " ", k=3)),
+                rng.choice(("what()", "from()", "select()", "where(", "how()")),
+            )
+        )
+
+    return "\n".join(
+        "".join(chunk() for _ in range(300)) for _ in range(scaled(6, scale))
+    )
+
+
+@generator(4)
+def generate_day_4(rng: random.Random, scale: float) -> str:
+    size = scaled(140, scale)
+    return "\n".join("".join(rng.choices("XMAS", k=size)) for _ in range(size))
+
+
+@generator(5)
+def generate_day_5(rng: random.Random, scale: float) -> str:
+    # rules come from one total order over all pages, so every update has a unique order
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f"{a}|{b}" for i, a in enumerate(pages) for b in pages[i + 1 :]]
+    rng.shuffle(rules)
+
+    updates = []
+    for _ in range(scaled(200, scale)):
+        update = rng.sample(pages, rng.choice(range(5, 24, 2)))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(",".join(map(str, update)))
+    return "\n".join(rules) + "\n\n" + "\n".join(updates)
+
+
+@generator(6)
+def generate_day_6(rng: random.Random, scale: float) -> str:
+    size = scaled(130, scale, minimum=5)
+
+    def guard_leaves(floor: list[bytearray], x: int, y: int) -> bool:
+        (dx, dy) = (0, -1)
+        seen = set()
+        while 0 <= x < size and 0 <= y < size:
+            if (x, y, dx, dy) in seen:
+                return False
+            seen.add((x, y, dx, dy))
+            if 0 <= x + dx < size and 0 <= y + dy < size:
+                if floor[y + dy][x + dx] == ord("#"):
+                    (dx, dy) = (-dy, dx)
+                    continue
+            (x, y) = (x + dx, y + dy)
+        return True
+
+    # the guard has to leave the area in the first problem, reroll until it does
+    while True:
+        floor = [
+            bytearray(rng.choices(b".#", weights=(19, 1), k=size)) for _ in range(size)
+        ]
+        (x, y) = (rng.randrange(size), rng.randrange(size))
+        floor[y][x] = ord("^")
+        if guard_leaves(floor, x, y):
+            return grid_to_str(floor)
+
+
+@generator(7)
+def generate_day_7(rng: random.Random, scale: float) -> str:
+    equations = []
+    for _ in range(scaled(850, scale)):
+        values = [rng.randint(1, 999) for _ in range(rng.randint(2, 12))]
+        result = values[0]
+        for value in values[1:]:
+            match rng.choice("+*|"):
+                case "+":
+                    result += value
+                case "*":
+                    result *= value
+                case "|":
+                    result = int(f"{result}{value}")
+
+        # about half of the equations can't be calibrated
+        if rng.random() < 0.5:
+            result += 1
+        equations.append(f"{result}: {' '.join(map(str, values))}")
+    return "\n".join(equations)
+
+
+@generator(8)
+def generate_day_8(rng: random.Random, scale: float) -> str:
+    size = scaled(50, scale)
+    city = [bytearray(b"." * size) for _ in range(size)]
+    frequencies = string.ascii_letters + string.digits
+    for _ in range(max(1, size * size // 15)):
+        (x, y) = (rng.randrange(size), rng.randrange(size))
+        city[y][x] = ord(rng.choice(frequencies))
+    return grid_to_str(city)
+
+
+@generator(9)
+def generate_day_9(rng: random.Random, scale: float) -> str:
+    # alternating file and free space lengths, starting and ending with a file
+    files = scaled(10000, scale)
+    disk_map = []
+    for i in range(files):
+        if i > 0:
+            disk_map.append(str(rng.randint(0, 9)))
+        disk_map.append(str(rng.randint(1, 9)))
+    return "".join(disk_map)
+
+
+@generator(10)
+def generate_day_10(rng: random.Random, scale: float) -> str:
+    size = scaled(50, scale, minimum=10)
+    mountains = [
+        bytearray(rng.choice(b"0123456789") for _ in range(size)) for _ in range(size)
+    ]
+
+    # lay down some actual trails, random noise barely has any
+    for _ in range(size * size // 40):
+        trail = [(rng.randrange(size), rng.randrange(size))]
+        while len(trail) < 10:
+            (x, y) = trail[-1]
+            steps = [
+                (x + dx, y + dy)
+                for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                if 0 <= x + dx < size
+                and 0 <= y + dy < size
+                and (x + dx, y + dy) not in trail
+            ]
+            if not steps:
+                break
+            trail.append(rng.choice(steps))
+        for (x, y), height in zip(trail, b"0123456789"):
+            mountains[y][x] = height
+    return grid_to_str(mountains)
+
+
+@generator(11)
+def generate_day_11(rng: random.Random, scale: float) -> str:
+    return " ".join(str(rng.randrange(10_000_000)) for _ in range(scaled(8, scale)))
+
+
+@generator(12)
+def generate_day_12(rng: random.Random, scale: float) -> str:
+    size = scaled(140, scale)
+    gardens = [bytearray(b"A" * size) for _ in range(size)]
+
+    # paint random rectangles on top of each other, leaves regions with ragged borders,
+    # their size is capped so the painting stays linear in the number of cells
+    max_side = min(14, max(1, size // 10))
+    for _ in range(size * size // 20):
+        w = rng.randint(1, max_side)
+        h = rng.randint(1, max_side)
+        (x, y) = (rng.randrange(size), rng.randrange(size))
+        plant = rng.choice(string.ascii_uppercase.encode())
+        for row in gardens[y : y + h]:
+            row[x : x + w] = bytes([plant]) * len(row[x : x + w])
+    return grid_to_str(gardens)
+
+
+@generator(13)
+def generate_day_13(rng: random.Random, scale: float) -> str:
+    games = []
+    for _ in range(scaled(320, scale)):
+        # buttons can't move in parallel, otherwise there is no unique solution
+        while True:
+            (ax, ay) = (rng.randint(10, 99), rng.randint(10, 99))
+            (bx, by) = (rng.randint(10, 99), rng.randint(10, 99))
+            if ax * by != ay * bx:
+                break
+
+        (a, b) = (rng.randint(0, 100), rng.randint(0, 100))
+        (px, py) = (a * ax + b * bx, a * ay + b * by)
+        if rng.random() < 0.5:
+            px += rng.randint(1, 9)
+        games.append(
+            f"Button A: X+{ax}, Y+{ay}\n"
+            f"Button B: X+{bx}, Y+{by}\n"
+            f"Prize: X={px}, Y={py}"
+        )
+    return "\n\n".join(games)
+
+
+@generator(14)
+def generate_day_14(rng: random.Random, scale: float) -> str:
+    # the lobby size is fixed by the puzzle, only the number of robots scales
+    (width, height) = (101, 103)
+    robots = []
+    for _ in range(scaled(500, scale)):
+        (px, py) = (rng.randrange(width), rng.randrange(height))
+        (vx, vy) = (rng.randint(-100, 100), rng.randint(-100, 100))
+        robots.append(f"p={px},{py} v={vx},{vy}")
+    return "\n".join(robots)
+
+
+@generator(15)
+def generate_day_15(rng: random.Random, scale: float) -> str:
+    size = scaled(50, scale, minimum=5)
+    floor = [bytearray(b"#" * size)]
+    for _ in range(size - 2):
+        row = bytearray(rng.choices(b".O#", weights=(5, 4, 1), k=size))
+        row[0] = row[-1] = ord("#")
+        floor.append(row)
+    floor.append(bytearray(b"#" * size))
+    floor[size // 2][size // 2] = ord("@")
+
+    moves = "".join(rng.choices("<>^v", k=scaled(20000, scale)))
+    moves = "\n".join(moves[i : i + 1000] for i in range(0, len(moves), 1000))
+    return grid_to_str(floor) + "\n\n" + moves
+
+
+@generator(16)
+def generate_day_16(rng: random.Random, scale: float) -> str:
+    size = odd(scaled(141, scale, minimum=5))
+    maze = carve_maze(rng, size)
+
+    # the real mazes have loops, knock out some walls between corridors
+    for _ in range(size * size // 50):
+        (x, y) = (rng.randrange(1, size - 1), rng.randrange(1, size - 1))
+        if (x + y) % 2 == 1:
+            maze[y][x] = ord(".")
+
+    maze[size - 2][1] = ord("S")
+    maze[1][size - 2] = ord("E")
+    return grid_to_str(maze)
+
+
+@generator(17)
+def generate_day_17(rng: random.Random, scale: float) -> str:
+    # The second problem only works on programs that shift A by three bits each loop and output
+    # one octal per shift, so we can only vary the constants of that program. Scale is ignored.
+    def run(a: int, xor_1: int, xor_2: int) -> list[int]:
+        out = []
+        while True:
+            b = (a % 8) ^ xor_1
+            c = a >> b
+            out.append((b ^ xor_2 ^ c) % 8)
+            a >>= 3
+            if a == 0:
+                return out
+
+    def find_quine(program: list[int], xor_1: int, xor_2: int) -> bool:
+        candidates = [0]
+        for octal in reversed(program):
+            candidates = [
+                a << 3 | i
+                for a in candidates
+                for i in range(8)
+                if run(a << 3 | i, xor_1, xor_2)[0] == octal
+            ]
+        return bool(candidates)
+
+    while True:
+        (xor_1, xor_2) = (rng.randrange(1, 8), rng.randrange(1, 8))
+        program = [2, 4, 1, xor_1, 7, 5, 1, xor_2, 4, 0, 0, 3, 5, 5, 3, 0]
+        if find_quine(program, xor_1, xor_2):
+            break
+
+    return (
+        f"Register A: {rng.randrange(8 ** 9, 8 ** 10)}\n"
+        f"Register B: 0\n"
+        f"Register C: 0\n"
+        f"\n"
+        f"Program: {','.join(map(str, program))}"
+    )
+
+
+@generator(18)
+def generate_day_18(rng: random.Random, scale: float) -> str:
+    # the memory space is fixed by the puzzle, so are the 1024 bytes of the first problem
+    size = 71
+    cells = [(x, y) for y in range(size) for x in range(size)]
+    cells.remove((0, 0))
+    cells.remove((size - 1, size - 1))
+
+    while True:
+        rng.shuffle(cells)
+        memory = [bytearray(b"." * size) for _ in range(size)]
+        for x, y in cells[:1024]:
+            memory[y][x] = ord("#")
+
+        # pad the memory with walls so the path search doesn't need range checks
+        padded = [bytearray(b"#" * (size + 2))]
+        padded += [bytearray(b"#") + row + bytearray(b"#") for row in memory]
+        padded += [bytearray(b"#" * (size + 2))]
+        if bfs_path(padded, (1, 1), (size, size))[-1] == (size, size):
+            break
+
+    bytes_to_fall = min(len(cells), scaled(3450, scale, minimum=1024))
+    return "\n".join(f"{x},{y}" for x, y in cells[:bytes_to_fall])
+
+
+@generator(19)
+def generate_day_19(rng: random.Random, scale: float) -> str:
+    # leave out a single red towel, so some designs become impossible
+    towels = set()
+    while len(towels) < 400:
+        towel = "".join(rng.choices("wubrg", k=rng.randint(1, 8)))
+        if towel != "r":
+            towels.add(towel)
+    towels = sorted(towels)
+
+    designs = []
+    for _ in range(scaled(400, scale)):
+        if rng.random() < 0.5:
+            design = ""
+            while len(design) < 40:
+                design += rng.choice(towels)
+        else:
+            design = "".join(rng.choices("wubrg", k=rng.randint(40, 60)))
+        designs.append(design)
+    return ", ".join(towels) + "\n\n" + "\n".join(designs)
+
+
+@generator(20)
+def generate_day_20(rng: random.Random, scale: float) -> str:
+    # the racetrack is a single path, so only keep the longest path through a perfect maze
+    size = odd(scaled(141, scale, minimum=5))
+    maze = carve_maze(rng, size)
+    start = bfs_path(maze, (1, 1))[-1]
+    track = bfs_path(maze, start)
+
+    racetrack = [bytearray(b"#" * size) for _ in range(size)]
+    for x, y in track:
+        racetrack[y][x] = ord(".")
+    racetrack[track[0][1]][track[0][0]] = ord("S")
+    racetrack[track[-1][1]][track[-1][0]] = ord("E")
+    return grid_to_str(racetrack)
+
+
+@generator(21)
+def generate_day_21(rng: random.Random, scale: float) -> str:
+    return "\n".join(f"{rng.randrange(1000):03d}A" for _ in range(scaled(5, scale)))
+
+
+@generator(22)
+def generate_day_22(rng: random.Random, scale: float) -> str:
+    return "\n".join(
+        str(rng.randrange(1, 16777216)) for _ in range(scaled(2000, scale))
+    )
+
+
+@generator(23)
+def generate_day_23(rng: random.Random, scale: float) -> str:
+    # Clusters of 13 computers with a few missing connections, one of them fully connected,
+    # and a single connection from each computer to another cluster. Names get longer once
+    # two letters run out.
+    clusters = scaled(40, scale)
+    nodes = clusters * 13
+    name_len = max(2, math.ceil(math.log(nodes * 2, 26)))
+    names = set()
+    while len(names) < nodes:
+        names.add("".join(rng.choices(string.ascii_lowercase, k=name_len)))
+    names = list(names)
+    rng.shuffle(names)
+
+    lan_party = rng.randrange(clusters)
+    connections = set()
+    for cluster in range(clusters):
+        members = names[cluster * 13 : (cluster + 1) * 13]
+        for i, lhs in enumerate(members):
+            for rhs in members[i + 1 :]:
+                if cluster == lan_party or rng.random() < 0.85:
+                    connections.add((lhs, rhs))
+        for lhs in members:
+            rhs = rng.choice(names)
+            if rhs not in members:
+                connections.add((lhs, rhs))
+
+    connections = [(l, r) if rng.random() < 0.5 else (r, l) for l, r in connections]
+    rng.shuffle(connections)
+    return "\n".join(f"{l}-{r}" for l, r in connections)
+
+
+@generator(24)
+def generate_day_24(rng: random.Random, scale: float) -> str:
+    # A ripple carry adder with four pairs of swapped outputs, each swap of a kind the second
+    # problem knows how to detect.
+    bits = scaled(45, scale, minimum=16)
+    used = set()
+
+    def wire() -> str:
+        while True:
+            name = "".join(rng.choices(string.ascii_lowercase[:23], k=3))
+            if name not in used:
+                used.add(name)
+                return name
+
+    # gates as output -> (lhs, operation, rhs), half adder first
+    gates: dict[str, tuple[str, str, str]] = {}
+    adders: list[dict[str, str]] = []
+    carry = wire()
+    gates["z00"] = ("x00", "XOR", "y00")
+    gates[carry] = ("x00", "AND", "y00")
+    for i in range(1, bits):
+        (x, y, z) = (f"x{i:02d}", f"y{i:02d}", f"z{i:02d}")
+        adder = {
+            "interim_sum": wire(),
+            "interim_carry": wire(),
+            "interim_sum_carry": wire(),
+            "out_sum": z,
+            "out_carry": f"z{bits:02d}" if i == bits - 1 else wire(),
+        }
+        gates[adder["interim_sum"]] = (x, "XOR", y)
+        gates[adder["interim_carry"]] = (x, "AND", y)
+        gates[adder["interim_sum_carry"]] = (carry, "AND", adder["interim_sum"])
+        gates[z] = (carry, "XOR", adder["interim_sum"])
+        gates[adder["out_carry"]] = (
+            adder["interim_sum_carry"],
+            "OR",
+            adder["interim_carry"],
+        )
+        adders.append(adder)
+        carry = adder["out_carry"]
+
+    # swap within four different full adders, away from the ends and each other
+    swap_bits = rng.sample(range(2, bits - 2, 3), 4)
+    for i in swap_bits:
+        adder = adders[i - 1]
+        (lhs, rhs) = rng.choice(
+            (
+                ("interim_sum", "interim_carry"),
+                ("out_sum", "interim_carry"),
+                ("out_sum", "interim_sum_carry"),
+                ("out_sum", "out_carry"),
+            )
+        )
+        (lhs, rhs) = (adder[lhs], adder[rhs])
+        gates[lhs], gates[rhs] = gates[rhs], gates[lhs]
+
+    initials = [f"x{i:02d}: {rng.randint(0, 1)}" for i in range(bits)]
+    initials += [f"y{i:02d}: {rng.randint(0, 1)}" for i in range(bits)]
+
+    lines = []
+    for output, (lhs, operation, rhs) in gates.items():
+        if rng.random() < 0.5:
+            (lhs, rhs) = (rhs, lhs)
+        lines.append(f"{lhs} {operation} {rhs} -> {output}")
+    rng.shuffle(lines)
+    return "\n".join(initials) + "\n\n" + "\n".join(lines)
+
+
+@generator(25)
+def generate_day_25(rng: random.Random, scale: float) -> str:
+    schematics = []
+    for _ in range(scaled(500, scale)):
+        heights = [rng.randint(0, 5) for _ in range(5)]
+        rows = [
+            "".join("#" if row <= height else "." for height in heights)
+            for row in range(1, 6)
+        ]
+        # locks hang from the top, keys stand on the bottom
+        if rng.random() < 0.5:
+            schematics.append("\n".join(["#####", *rows, "....."]))
+        else:
+            schematics.append("\n".join([".....", *reversed(rows), "#####"]))
+    return "\n\n".join(schematics)
@@ -0,0 +1,118 @@
+from typing import Iterator
+
+from vector import Packing, Vector
+
+if __name__ == "__main__":
+    print("Can't run grid.py on its own...")
+    exit(1)
+
+
+class Grid:
+    """
+    A character grid stored as one flat bytearray, surrounded by `padding` cells of `border`.
+    Cells are addressed by flat indices, neighbors are found by adding one of the offsets and
+    thanks to the border a 4- or 8-neighbor is never out of range, no bounds checks needed.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        cells: bytearray,
+        padding: int = 1,
+        border: int = 0,
+    ):
+        self.width = width
+        self.height = height
+        self.cells = cells
+        self.padding = padding
+        self.border = border
+        self.stride = width + 2 * padding
+
+        # cells are packed with the border, offsets to neighbors are the same as for Packing
+        packing = Packing(self.stride, height + 2 * padding)
+        self.offsets_4 = packing.offsets_4
+        self.offsets_8 = packing.offsets_8
+
+    @staticmethod
+    def parse(data: str, padding: int = 1, border: int = 0) -> "Grid":
+        lines = data.encode().splitlines()
+        width = len(lines[0])
+        height = len(lines)
+
+        stride = width + 2 * padding
+        edge = bytes([border]) * (stride * padding)
+        side = bytes([border]) * padding
+        cells = bytearray(edge)
+        for line in lines:
+            cells += side
+            cells += line
+            cells += side
+        cells += edge
+        return Grid(width, height, cells, padding, border)
+
+    def index(self, x: int, y: int) -> int:
+        return (y + self.padding) * self.stride + x + self.padding
+
+    def coords(self, index: int) -> Vector:
+        (y, x) = divmod(index, self.stride)
+        return Vector.from_xy(x - self.padding, y - self.padding)
+
+    def in_range(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def steps_in_range(self, x: int, y: int, dx: int, dy: int) -> int:
+        """How many steps of (dx, dy) can be taken from (x, y) without leaving the grid"""
+        steps = max(self.width, self.height)
+        if dx > 0:
+            steps = min(steps, (self.width - 1 - x) // dx)
+        elif dx < 0:
+            steps = min(steps, x // -dx)
+        if dy > 0:
+            steps = min(steps, (self.height - 1 - y) // dy)
+        elif dy < 0:
+            steps = min(steps, y // -dy)
+        return steps
+
+    def __getitem__(self, index: int) -> int:
+        return self.cells[index]
+
+    def __setitem__(self, index: int, tile: int):
+        self.cells[index] = tile
+
+    def find(self, tile: bytes, start: int = 0) -> int:
+        """Flat index of the first `tile` at or after `start`, or -1"""
+        return self.cells.find(tile, start)
+
+    def find_all(self, tile: bytes) -> Iterator[int]:
+        index = self.cells.find(tile)
+        while index != -1:
+            yield index
+            index = self.cells.find(tile, index + 1)
+
+    def row(self, y: int) -> memoryview:
+        start = self.index(0, y)
+        return memoryview(self.cells)[start : start + self.width]
+
+    def rows(self) -> Iterator[memoryview]:
+        return (self.row(y) for y in range(self.height))
+
+    def indices(self) -> Iterator[int]:
+        """Flat indices of all cells inside the border, row by row"""
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+    def as_array(self):
+        """The padded cells as a (height + 2 * padding) x stride uint8 view, no copy"""
+        import numpy as np
+
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(-1, self.stride)
+
+    def copy(self) -> "Grid":
+        return Grid(
+            self.width, self.height, bytearray(self.cells), self.padding, self.border
+        )
+
+    def __str__(self):
+        return "\n".join(str(row, "utf-8") for row in self.rows())
@@ -0,0 +1,150 @@
+import hashlib
+import mmap
+import os
+import pathlib
+from typing import Iterator
+
+import cli
+
+if __name__ == "__main__":
+    print("Can't run inputs.py on its own...")
+    exit(1)
+
+YEAR = 2024
+
+# Inputs are cached next to the solutions, but are not supposed to be committed, the AoC
+# authors ask for them to not be shared. Can be moved via the environment for CI boxes.
+input_dir = pathlib.Path(
+    os.environ.get("AOC_INPUT_DIR", pathlib.Path(__file__).parent / "inputs")
+)
+
+
+class InputError(Exception):
+    pass
+
+
+def input_path(day: int) -> pathlib.Path:
+    return input_dir / f"{YEAR}_{day}.txt"
+
+
+def checksum_path(day: int) -> pathlib.Path:
+    return input_dir / f"{YEAR}_{day}.sha256"
+
+
+def map_file(path: pathlib.Path) -> mmap.mmap | bytes:
+    with open(path, "rb") as f:
+        # can't map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def to_text(raw: mmap.mmap | bytes) -> str:
+    # same as what aocd gives us, no trailing newline
+    return str(raw, "utf-8").rstrip("\r\n")
+
+
+def iter_line_chunks(
+    raw: mmap.mmap | bytes, chunk_size: int = 1 << 24
+) -> Iterator[bytes]:
+    """Splits raw input into chunks of about `chunk_size` bytes that end on a line break"""
+    start = 0
+    while start < len(raw):
+        end = len(raw)
+        if start + chunk_size < end:
+            # a line longer than a chunk goes in whole
+            end = (
+                raw.rfind(b"\n", start, start + chunk_size) + 1
+                or raw.find(b"\n", start) + 1
+                or end
+            )
+        yield raw[start:end]
+        start = end
+
+
+################################################################################################
+# Providers
+class InputProvider:
+    def get_bytes(self, day: int) -> mmap.mmap | bytes:
+        raise NotImplementedError
+
+    def get_data(self, day: int) -> str:
+        raw = self.get_bytes(day)
+        try:
+            return to_text(raw)
+        finally:
+            if isinstance(raw, mmap.mmap):
+                raw.close()
+
+
+class FileInputProvider(InputProvider):
+    """Serves any day from one explicit file, i.e. `--input PATH`."""
+
+    def __init__(self, path: str | pathlib.Path):
+        self.path = pathlib.Path(path)
+
+    def get_bytes(self, day: int) -> mmap.mmap | bytes:
+        if not self.path.is_file():
+            raise InputError(f"Input file {self.path} does not exist")
+        return map_file(self.path)
+
+
+class CachedInputProvider(InputProvider):
+    """Serves inputs from the local cache, optionally fetching missing ones with aocd."""
+
+    def __init__(self, offline: bool = False):
+        self.offline = offline
+
+    def get_bytes(self, day: int) -> mmap.mmap | bytes:
+        path = input_path(day)
+        if not path.is_file():
+            if self.offline:
+                raise InputError(f"No cached input for day {day} at {path}")
+            fetch(day)
+
+        raw = map_file(path)
+        verify(day, raw)
+        return raw
+
+
+def fetch(day: int, force: bool = False) -> pathlib.Path:
+    path = input_path(day)
+    if path.is_file() and not force:
+        return path
+
+    # only now pay for aocd, its token lookup and the network
+    import aocd
+
+    data = aocd.get_data(day=day, year=YEAR) + "\n"
+    input_dir.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data.encode("utf-8"))
+    checksum_path(day).write_text(hashlib.sha256(data.encode("utf-8")).hexdigest())
+    return path
+
+
+def verify(day: int, raw: mmap.mmap | bytes) -> None:
+    # inputs dropped into the cache by hand don't need a checksum
+    expected_path = checksum_path(day)
+    if not expected_path.is_file():
+        return
+
+    expected = expected_path.read_text().strip()
+    actual = hashlib.sha256(raw).hexdigest()
+    if actual != expected:
+        raise InputError(
+            f"Cached input for day {day} is corrupt, expected sha256 {expected} got {actual}"
+        )
+
+
+def provider() -> InputProvider:
+    if cli.input_path is not None:
+        return FileInputProvider(cli.input_path)
+    return CachedInputProvider(offline=cli.offline)
+
+
+def get_data(day: int) -> str:
+    return provider().get_data(day)
+
+
+def get_bytes(day: int) -> mmap.mmap | bytes:
+    return provider().get_bytes(day)
@@ -0,0 +1,91 @@
+import collections
+import json
+import pathlib
+
+if __name__ == "__main__":
+    print("Can't run metrics.py on its own...")
+    exit(1)
+
+# Off by default. Hot loops copy this into a local and report once they are done, so with
+# metrics disabled a search pays one attribute lookup and a few branches on a local.
+enabled = False
+
+counters: dict[str, int] = collections.Counter()
+maxima: dict[str, int] = {}
+histograms: dict[str, "Histogram"] = {}
+
+# key -> everything recorded for it, e.g. "6" -> {"day6.candidates": 5000, ...}
+collected: dict[str, dict] = {}
+
+
+class Histogram:
+    """Count, sum and extremes of the observed values, bucketed by powers of two."""
+
+    __slots__ = ("count", "sum", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+        self.buckets: dict[int, int] = collections.Counter()
+
+    def observe(self, value: int) -> None:
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        # bucket n holds values up to 2**n
+        self.buckets[max(0, int(value) - 1).bit_length()] += 1
+
+    def to_json(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0,
+            "min": self.min,
+            "max": self.max,
+            "buckets": {
+                f"<={2**bucket}": self.buckets[bucket]
+                for bucket in sorted(self.buckets)
+            },
+        }
+
+
+def count(name: str, value: int = 1) -> None:
+    counters[name] += value
+
+
+def maximum(name: str, value: int) -> None:
+    if value > maxima.get(name, value - 1):
+        maxima[name] = value
+
+
+def observe(name: str, value: int) -> None:
+    if name not in histograms:
+        histograms[name] = Histogram()
+    histograms[name].observe(value)
+
+
+def collect(key: str) -> None:
+    """Files everything recorded since the last call under `key`, e.g. the day, and starts over"""
+    snapshot = {
+        **counters,
+        **maxima,
+        **{name: histogram.to_json() for name, histogram in histograms.items()},
+    }
+    counters.clear()
+    maxima.clear()
+    histograms.clear()
+    if snapshot:
+        collected[key] = dict(sorted(snapshot.items()))
+
+
+def save(path: str) -> None:
+    text = json.dumps(collected, indent=2)
+    collected.clear()
+    if path == "-":
+        print(text)
+    else:
+        pathlib.Path(path).write_text(text)
+        print(f"Saved metrics to {path}")
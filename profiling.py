@@ -1,12 +1,254 @@
-from decorator import decorator
-from line_profiler import LineProfiler
-
-
-@decorator
-def profile_each_line(func, *args, **kwargs):
-    profiler = LineProfiler()
-    profiled_func = profiler(func)
-    try:
-        return profiled_func(*args, **kwargs)
-    finally:
-        profiler.print_stats()
+import collections
+import pathlib
+import sys
+import threading
+from typing import Callable
+
+import cli
+
+
+def profile_each_line(func):
+    # only imported when used, aoc run and bench need none of the profiling packages
+    from decorator import decorator
+
+    def profiled(func, *args, **kwargs):
+        from line_profiler import LineProfiler
+
+        profiler = LineProfiler()
+        profiled_func = profiler(func)
+        try:
+            return profiled_func(*args, **kwargs)
+        finally:
+            profiler.print_stats()
+
+    return decorator(profiled, func)
+
+
+################################################################################################
+# Profilers for aoc run/bench, every profiler keeps collecting over all calls it wraps
+# so the results of many benchmark repetitions end up in one report
+def frame_label(filename: str, line: int, name: str) -> str:
+    # the format py-spy uses, flamegraph tools split stacks on ';'
+    return f"{name} ({pathlib.Path(filename).name}:{line})"
+
+
+def with_suffix(stem: pathlib.Path, suffix: str) -> pathlib.Path:
+    # names like "2024_6@0.5_part2" have dots that Path.with_suffix would cut off
+    return stem.with_name(stem.name + suffix)
+
+
+def write_collapsed(path: pathlib.Path, stacks: dict[str, int]) -> None:
+    with open(path, "w") as f:
+        for stack, count in sorted(stacks.items()):
+            if count > 0:
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    def wrap(self, func: Callable) -> Callable:
+        def profiled(*args, **kwargs):
+            self.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.stop()
+
+        return profiled
+
+    def start(self) -> None:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        raise NotImplementedError
+
+    def save(self, stem: pathlib.Path) -> list[pathlib.Path]:
+        raise NotImplementedError
+
+
+class LineProfiler(Profiler):
+    """Times each line of the wrapped functions, but not of the functions they call."""
+
+    def __init__(self):
+        from line_profiler import LineProfiler
+
+        self.profiler = LineProfiler()
+
+    def wrap(self, func: Callable) -> Callable:
+        self.profiler.add_function(func)
+        return super().wrap(func)
+
+    def start(self) -> None:
+        self.profiler.enable_by_count()
+
+    def stop(self) -> None:
+        self.profiler.disable_by_count()
+
+    def save(self, stem: pathlib.Path) -> list[pathlib.Path]:
+        stats_path = with_suffix(stem, ".lprof")
+        self.profiler.dump_stats(stats_path)
+        text_path = with_suffix(stem, ".txt")
+        with open(text_path, "w") as f:
+            self.profiler.print_stats(stream=f)
+        return [stats_path, text_path]
+
+
+class CProfiler(Profiler):
+    """
+    Deterministic profiling with cProfile. Besides the .pstats the call graph is flattened
+    into collapsed stacks for flamegraphs, splitting the time of functions with several
+    callers in proportion to how much time each caller spent in them.
+    """
+
+    # prune branches that would show up as less than a microsecond
+    min_time = 1e-6
+
+    def __init__(self):
+        import cProfile
+
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+
+    def collapsed_stacks(self) -> dict[str, int]:
+        import pstats
+
+        stats = pstats.Stats(self.profile).stats
+        callees = collections.defaultdict(list)
+        for func, (_, _, _, _, callers) in stats.items():
+            for caller, (_, _, _, edge_time) in callers.items():
+                callees[caller].append((func, edge_time))
+
+        stacks = collections.defaultdict(int)
+        stack: list[str] = []
+        on_stack = set()
+
+        def walk(func, share: float):
+            (_, _, own_time, _, _) = stats[func]
+            stack.append(frame_label(*func))
+            on_stack.add(func)
+            stacks[";".join(stack)] += round(own_time * share * 1e6)
+            for callee, edge_time in callees[func]:
+                callee_time = stats[callee][3]
+                if callee in on_stack or callee_time == 0:
+                    continue
+                callee_share = share * min(1.0, edge_time / callee_time)
+                if callee_time * callee_share >= self.min_time:
+                    walk(callee, callee_share)
+            on_stack.remove(func)
+            stack.pop()
+
+        # the only roots besides the wrapped function are stop() and its disable() call
+        for func, (_, _, _, _, callers) in stats.items():
+            if not callers and func[0] not in (__file__, "~"):
+                walk(func, 1.0)
+        return stacks
+
+    def save(self, stem: pathlib.Path) -> list[pathlib.Path]:
+        stats_path = with_suffix(stem, ".pstats")
+        self.profile.dump_stats(stats_path)
+        collapsed_path = with_suffix(stem, ".collapsed.txt")
+        write_collapsed(collapsed_path, self.collapsed_stacks())
+        return [stats_path, collapsed_path]
+
+
+class SamplingProfiler(Profiler):
+    """
+    Records the stack of the profiled thread every `interval` seconds of CPU time via
+    SIGPROF, the overhead stays low no matter how many calls the code makes. Where there
+    are no interval timers, i.e. on Windows, a thread samples the stack instead.
+    """
+
+    interval = 0.001
+
+    def __init__(self):
+        self.stacks = collections.defaultdict(int)
+        self.root = None
+        self.thread_id = None
+        self.sampler = None
+        self.stopped = threading.Event()
+        self.previous_handler = None
+
+    def record(self, frame) -> None:
+        labels = []
+        while frame is not None and frame is not self.root:
+            code = frame.f_code
+            labels.append(
+                frame_label(code.co_filename, code.co_firstlineno, code.co_name)
+            )
+            frame = frame.f_back
+        if labels:
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def on_signal(self, signum, frame) -> None:
+        self.record(frame)
+
+    def sample_thread(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.record(sys._current_frames().get(self.thread_id))
+
+    def start(self) -> None:
+        import signal
+
+        # stacks are cut off at the caller, so they start at the wrapped function
+        self.root = sys._getframe(1)
+        self.thread_id = threading.get_ident()
+        if (
+            hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+        ):
+            self.previous_handler = signal.signal(signal.SIGPROF, self.on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self.stopped.clear()
+            self.sampler = threading.Thread(target=self.sample_thread, daemon=True)
+            self.sampler.start()
+
+    def stop(self) -> None:
+        import signal
+
+        if self.sampler is None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self.previous_handler)
+        else:
+            self.stopped.set()
+            self.sampler.join()
+            self.sampler = None
+        self.root = None
+
+    def save(self, stem: pathlib.Path) -> list[pathlib.Path]:
+        collapsed_path = with_suffix(stem, ".collapsed.txt")
+        write_collapsed(collapsed_path, self.stacks)
+        return [collapsed_path]
+
+
+profilers = {
+    "line": LineProfiler,
+    "cprofile": CProfiler,
+    "sample": SamplingProfiler,
+}
+
+# name -> profiler, e.g. "2024_6_part2"
+active_profilers: dict[str, Profiler] = {}
+
+
+def wrap(name: str, func: Callable) -> Callable:
+    """Runs `func` under the profiler `cli.profile` selects, if any, collecting into `name`"""
+    if cli.profile is None:
+        return func
+
+    if name not in active_profilers:
+        active_profilers[name] = profilers[cli.profile]()
+    return active_profilers[name].wrap(func)
+
+
+def save(directory: pathlib.Path) -> list[pathlib.Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, profiler in active_profilers.items():
+        paths.extend(profiler.save(directory / name))
+    active_profilers.clear()
+    return paths
@@ -0,0 +1,67 @@
+import sys
+import time
+from typing import Iterable, Iterator, TypeVar
+
+import cli
+import metrics
+
+if __name__ == "__main__":
+    print("Can't run progress.py on its own...")
+    exit(1)
+
+T = TypeVar("T")
+
+# seconds between two redraws of the progress line
+interval = 0.1
+
+
+def progress(
+    iterable: Iterable[T], total: int | None = None, desc: str | None = None
+) -> Iterable[T]:
+    """
+    Reports how far a loop over `iterable` got, to stderr with `--progress` and as item count
+    to the metrics with `--metrics`. With neither the iterable is handed back untouched, so
+    wrapping hot loops is free by default.
+    """
+    if not cli.progress and not metrics.enabled:
+        return iterable
+
+    if desc is None:
+        caller = sys._getframe(1)
+        desc = f"{caller.f_globals['__name__']}.{caller.f_code.co_name}"
+    if total is None and hasattr(iterable, "__len__"):
+        total = len(iterable)
+    return report(iterable, total, desc)
+
+
+def format_line(desc: str, count: int, total: int | None, elapsed: float) -> str:
+    rate = count / elapsed if elapsed > 0 else 0
+    if total:
+        return f"{desc}: {count}/{total} ({count / total:.0%}, {rate:.0f}it/s)"
+    return f"{desc}: {count} ({rate:.0f}it/s)"
+
+
+def report(iterable: Iterable[T], total: int | None, desc: str) -> Iterator[T]:
+    show = cli.progress
+    count = 0
+    start = last_draw = time.perf_counter()
+    drawn = False
+    try:
+        for item in iterable:
+            yield item
+            count += 1
+            if show:
+                # only the clock is read per item, drawing waits for the interval
+                now = time.perf_counter()
+                if now - last_draw >= interval:
+                    sys.stderr.write(
+                        f"\r{format_line(desc, count, total, now - start)}"
+                    )
+                    last_draw = now
+                    drawn = True
+    finally:
+        if drawn:
+            elapsed = time.perf_counter() - start
+            sys.stderr.write(f"\r{format_line(desc, count, total, elapsed)}\n")
+        if metrics.enabled:
+            metrics.count(f"progress.{desc}", count)
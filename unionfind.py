@@ -0,0 +1,31 @@
+from array import array
+
+
+class UnionFind:
+    """Disjoint sets over the ints 0..size-1, with union by size and path halving"""
+
+    def __init__(self, size: int) -> None:
+        self.parent = array("l", range(size))
+        self.size = array("l", [1]) * size
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> int:
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return a
+
+        if self.size[a] < self.size[b]:
+            (a, b) = (b, a)
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
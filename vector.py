@@ -1,22 +1,30 @@
 import math
-from typing import NamedTuple
+from typing import Iterable, Iterator, NamedTuple
+
+# skips the generated NamedTuple constructor, which has to bind its arguments by name
+_new = tuple.__new__
 
 
 class Vector(NamedTuple):
     x: int
     y: int
 
+    @staticmethod
+    def from_xy(x: int, y: int) -> "Vector":
+        """Same as Vector(x, y), but faster for hot loops"""
+        return _new(Vector, (x, y))
+
     def __add__(lhs, rhs):
-        return Vector(lhs.x + rhs.x, lhs.y + rhs.y)
+        return _new(Vector, (lhs[0] + rhs[0], lhs[1] + rhs[1]))
 
     def __sub__(lhs, rhs):
-        return Vector(lhs.x - rhs.x, lhs.y - rhs.y)
+        return _new(Vector, (lhs[0] - rhs[0], lhs[1] - rhs[1]))
 
     def __mul__(lhs, rhs: int):
-        return Vector(lhs.x * rhs, lhs.y * rhs)
+        return _new(Vector, (lhs[0] * rhs, lhs[1] * rhs))
 
     def __truediv__(lhs, rhs: int):
-        return Vector(lhs.x / rhs, lhs.y / rhs)
+        return _new(Vector, (lhs[0] / rhs, lhs[1] / rhs))
 
     def __str__(self):
         return f"{self.x},{self.y}"
@@ -35,3 +43,114 @@ class Vector(NamedTuple):
 
     def manhattan_dist(self, rhs):
         return (self - rhs).manhattan_len()
+
+
+################################################################################################
+# Packed vectors
+class Packing:
+    """
+    Encodes positions in a width x height area as single ints `x + y * stride`, which hash and
+    compare much faster than Vectors and can be moved around with plain int additions.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.stride = width
+
+        # right, down, left, up and then the diagonals
+        self.offsets_4 = (1, self.stride, -1, -self.stride)
+        self.offsets_8 = self.offsets_4 + (
+            self.stride + 1,
+            self.stride - 1,
+            -self.stride - 1,
+            -self.stride + 1,
+        )
+
+    def pack(self, x: int, y: int) -> int:
+        return x + y * self.stride
+
+    def unpack(self, packed: int) -> Vector:
+        (y, x) = divmod(packed, self.stride)
+        return _new(Vector, (x, y))
+
+    def in_range(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def neighbors(self, packed: int) -> Iterator[int]:
+        """The up to four packed neighbors that lie within the area"""
+        (y, x) = divmod(packed, self.stride)
+        if x + 1 < self.width:
+            yield packed + 1
+        if y + 1 < self.height:
+            yield packed + self.stride
+        if x > 0:
+            yield packed - 1
+        if y > 0:
+            yield packed - self.stride
+
+
+################################################################################################
+# Vector arrays
+class VectorArray:
+    """
+    Many vectors at once, as an n x 2 NumPy array. Supports the arithmetic of Vector, with
+    either another VectorArray of the same length, a single Vector or a scalar.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+    @staticmethod
+    def from_vectors(vectors: Iterable[Vector]) -> "VectorArray":
+        import numpy as np
+
+        return VectorArray(np.array(list(vectors), dtype=np.int64).reshape(-1, 2))
+
+    @staticmethod
+    def _operand(rhs):
+        if isinstance(rhs, VectorArray):
+            return rhs.data
+        if isinstance(rhs, tuple):
+            import numpy as np
+
+            return np.array(rhs)
+        return rhs
+
+    def __add__(lhs, rhs) -> "VectorArray":
+        return VectorArray(lhs.data + VectorArray._operand(rhs))
+
+    def __sub__(lhs, rhs) -> "VectorArray":
+        return VectorArray(lhs.data - VectorArray._operand(rhs))
+
+    def __mul__(lhs, rhs) -> "VectorArray":
+        return VectorArray(lhs.data * VectorArray._operand(rhs))
+
+    def __floordiv__(lhs, rhs) -> "VectorArray":
+        return VectorArray(lhs.data // VectorArray._operand(rhs))
+
+    def __mod__(lhs, rhs) -> "VectorArray":
+        return VectorArray(lhs.data % VectorArray._operand(rhs))
+
+    @property
+    def x(self):
+        return self.data[:, 0]
+
+    @property
+    def y(self):
+        return self.data[:, 1]
+
+    def mean(self) -> Vector:
+        (x, y) = self.data.mean(axis=0)
+        return Vector(float(x), float(y))
+
+    def pack(self, packing: Packing):
+        return self.x + self.y * packing.stride
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[Vector]:
+        return (Vector(int(x), int(y)) for x, y in self.data)